@@ -1,55 +1,225 @@
+import time
+STARTED = time.perf_counter()  # Início da inicialização, antes das importações pesadas
+
 import sys
 import os
 import logging
+import threading
 
 # PyQt
 from PySide6 import QtCore, QtGui, QtWidgets
-from PySide6.QtWidgets import QPushButton, QTextEdit, QLineEdit, QFileDialog, QComboBox
-from PySide6.QtUiTools import QUiLoader
+from PySide6.QtWidgets import QPushButton, QTextEdit, QLineEdit, QFileDialog, QComboBox, QCheckBox, QLabel
 from PySide6.QtGui import QFont
-from pyqtgraph import PlotWidget
+from pyqtgraph import PlotWidget, PlotDataItem
 
 # Source
 from src import Waveform
-from src import Tektronix
+from src.util import configure_logging
 
-# Configuração básica do logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class Main:
+UI_MODULE = "ui/ui_mainwindow.py"  # Gerado por: pyside6-uic ui/mainwindow.ui -o ui/ui_mainwindow.py
+
+# Cor de cada fonte no gráfico, como na tela do osciloscópio
+CURVE_PENS = {"CH1": "y", "CH2": "c", "MATH": "m", "REF1": "w", "REF2": (150, 150, 150)}
+
+class AcquisitionWorker(QtCore.QObject):
+    """
+    Executa os comandos do Tektronix em uma thread dedicada, fora do loop de eventos da interface.
+
+    O objeto Tektronix é criado e usado somente dentro da thread do worker. Os pedidos feitos pela
+    interface são entregues por sinais enfileirados (QueuedConnection), então várias capturas podem
+    ser enfileiradas e são executadas em ordem, uma de cada vez.
+
+    No modo contínuo (start_run), cada captura é agendada no loop de eventos da thread, então os
+    pedidos avulsos continuam sendo atendidos entre as capturas. Uma captura só é feita depois que
+    o instrumento adquire um registro novo (ACQ:NUMAC? muda), para o mesmo registro não ser lido
+    e contado duas vezes. Apenas o quadro mais recente é guardado: se a interface ainda não exibiu
+    o anterior, ele é descartado em vez de enfileirado.
+    """
+    requested = QtCore.Signal(str, object)  # (nome do método do Tektronix, argumentos)
+    run_requested = QtCore.Signal(int, object)  # (execução do modo contínuo, fontes capturadas)
+    connected = QtCore.Signal(object)       # Informações do dispositivo (device_id)
+    finished = QtCore.Signal(str, object)   # (nome do método, resultado)
+    failed = QtCore.Signal(str, str)        # (nome do método, mensagem de erro)
+    frame_ready = QtCore.Signal()           # Há um quadro novo em take_frame()
+
+    def __init__(self):
+        super().__init__()
+        self.tektronix = None  # Tektronix, criado por open() na thread do worker
+        self.running = False
+        self.records = 0   # Registros capturados no modo contínuo
+        self.dropped = 0   # Quadros descartados porque a interface não os exibiu a tempo
+        self.__acquisitions = None  # ACQ:NUMAC? logo após o último quadro
+        self.__generation = 0  # Execução mais recente pedida por start_run
+        self.__current = 0     # Execução cujos contadores estão em records e dropped
+        self.__frame: dict[str, Waveform] | None = None
+        self.__frame_lock = threading.Lock()
+        self.requested.connect(self.execute)
+        # Enfileirada também quando emitida pela própria thread do worker, para agendar o próximo quadro
+        self.run_requested.connect(self.run, QtCore.Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, name: str, *args):
+        """Enfileira a execução de um método do Tektronix na thread do worker."""
+        logger.debug(f"Queueing request: {name}{args}")
+        self.requested.emit(name, args)
+
+    def start_run(self, sources):
+        """Inicia a captura contínua das fontes na thread do worker."""
+        logger.debug(f"Starting continuous acquisition: {sources}")
+        # Cada execução tem um número: um quadro ainda em captura de uma execução anterior não
+        # agenda mais quadros, então ligar e desligar o modo contínuo não cria dois laços
+        self.__generation += 1
+        self.running = True
+        self.run_requested.emit(self.__generation, tuple(sources))
+
+    def stop_run(self):
+        """Encerra a captura contínua após o quadro atual. Pode ser chamado de qualquer thread."""
+        logger.debug("Stopping continuous acquisition")
+        self.running = False
+
+    def take_frame(self) -> dict[str, Waveform] | None:
+        """Retorna o quadro mais recente ({fonte: Waveform}) e o remove, ou None se não houver."""
+        with self.__frame_lock:
+            frame, self.__frame = self.__frame, None
+        return frame
+
+    @QtCore.Slot(int, object)
+    def run(self, generation: int, sources: tuple):
+        """Captura um quadro das fontes e agenda o próximo enquanto o modo contínuo estiver ativo."""
+        if not self.running or generation != self.__generation:
+            return  # Execução encerrada ou substituída por outra
+        if generation != self.__current:
+            # Primeiro quadro da execução: os contadores são reiniciados na thread do worker
+            self.__current = generation
+            self.records = self.dropped = 0
+            self.__acquisitions = None
+        if not self.tektronix:
+            self.running = False
+            self.failed.emit("run", "Tektronix not connected")
+            return
+        try:
+            # O acquire() congela a aquisição e a retoma ao final: espera o instrumento adquirir um
+            # registro novo antes de congelá-la de novo, consultando-o a cada passagem pelo loop
+            if self.__acquisitions is not None and self.tektronix.acquisition_count() == self.__acquisitions:
+                self.run_requested.emit(generation, sources)
+                return
+            waveforms = self.tektronix.acquire(sources)
+            self.__acquisitions = self.tektronix.acquisition_count()
+        except Exception as e:
+            logger.error(f"Continuous acquisition failed: {e}")
+            if generation == self.__generation:
+                self.running = False
+                self.failed.emit("run", str(e))
+            return
+
+        if generation != self.__generation:
+            return  # O modo contínuo foi reiniciado durante a captura: o quadro é descartado
+        if waveforms:
+            self.records += len(waveforms)
+            with self.__frame_lock:
+                stale = self.__frame is not None
+                self.__frame = waveforms
+            if stale:
+                self.dropped += 1  # A interface já tem um aviso pendente e vai pegar este quadro
+            else:
+                self.frame_ready.emit()
+        self.run_requested.emit(generation, sources)
+
+    @QtCore.Slot()
+    def open(self):
+        """Procura o osciloscópio e abre a conexão serial."""
+        try:
+            from src import Tektronix  # Carregado na thread do worker, depois que a janela é exibida
+            self.tektronix = Tektronix()
+            self.connected.emit(self.tektronix.device_id())
+        except Exception as e:
+            logger.error(f"Failed to open Tektronix: {e}")
+            self.failed.emit("open", str(e))
+
+    @QtCore.Slot()
+    def close(self):
+        """Fecha a porta serial do osciloscópio."""
+        if self.tektronix:
+            self.tektronix.close_port()
+
+    @QtCore.Slot(str, object)
+    def execute(self, name: str, args: tuple):
+        """Executa um método do Tektronix e emite o resultado."""
+        if not self.tektronix:
+            self.failed.emit(name, "Tektronix not connected")
+            return
+        try:
+            result = getattr(self.tektronix, name)(*args)
+        except Exception as e:
+            logger.error(f"Request {name} failed: {e}")
+            self.failed.emit(name, str(e))
+            return
+        self.finished.emit(name, result)
+
+
+class Main(QtCore.QObject):
     def __init__(self):
         """Inicializa a classe Main e configura a interface do usuário."""
+        super().__init__()
         logger.debug("Initializing Main class")
-        
-        # Loader config
-        loader = QUiLoader()
-        loader.registerCustomWidget(PlotWidget)
-        self.ui = loader.load("ui/mainwindow.ui")
 
+        self.ui = self.load_ui()
         if not self.ui:
             logger.error("Failed to load UI file.")
             sys.exit(1)
 
-        self.tektronix = Tektronix()
-
-        self.config_informations()
+        self.plot_graph: PlotWidget = self.ui.findChild(PlotWidget)
+        self.curves: dict[str, PlotDataItem] = {}  # Uma curva por fonte, atualizada com setData
+        self.y_range = None
+        self.frames = 0                 # Quadros exibidos desde a última atualização da taxa
+        self.rate_time = time.monotonic()
+        self.rate_records = 0
         self.plot_config()
         self.connect_buttons()
         self.waveform: Waveform = None  # Atributo para armazenar a waveform atual
         self.buttons_enabled = True     # Flag para controlar o estado dos botões
-
-        # Exemplo de carregamento de waveform (comentado para evitar execução automática)
-        waveform = Waveform.from_file('2025-02-11_15:48:57_142614.txt')
-        self.show_waveform(waveform)
-        
+        self.acquisition_config()
         self.windown_config()
-        self.tektronix.start()
-    
-    def run(self):
-        """Executa a aplicação, exibindo a janela principal."""
+
+    @staticmethod
+    def load_ui() -> QtWidgets.QMainWindow | None:
+        """
+        Cria a janela principal a partir da interface compilada (ui/ui_mainwindow.py).
+
+        O módulo compilado é versionado junto com ui/mainwindow.ui e deve ser gerado novamente a
+        cada mudança no .ui; tests/test_ui.py verifica que os dois estão de acordo.
+        """
+        try:
+            from ui.ui_mainwindow import Ui_MainWindow
+        except ImportError as e:
+            logger.error(f"Failed to import {UI_MODULE}: {e}")
+            return None
+        window = QtWidgets.QMainWindow()
+        window.form = Ui_MainWindow()  # Mantém a referência aos widgets gerados
+        window.form.setupUi(window)
+        return window
+
+    def run(self, on_shown=None):
+        """
+        Executa a aplicação, exibindo a janela principal.
+
+        A busca pelo osciloscópio começa depois que a janela é exibida, na thread de aquisição.
+
+        Parâmetros:
+            on_shown (callable, opcional): Chamada com o tempo de inicialização, em segundos, quando a janela é exibida.
+        """
         logger.debug("Running application")
         self.ui.show()
+        QtCore.QTimer.singleShot(0, lambda: self.on_shown(on_shown))
+
+    def on_shown(self, callback=None):
+        """Registra o tempo de inicialização e inicia a thread de aquisição."""
+        startup = time.perf_counter() - STARTED
+        logger.info(f"Window shown {startup:.3f} s after start")
+        self.acquisition_thread.start()
+        if callback:
+            callback(startup)
 
     # Métodos de Configuração
     def windown_config(self):
@@ -65,13 +235,35 @@ class Main:
             logger.warning("Combox not found")
             return
 
-        combox.addItems(["txt", "csv"])        
-
-    def config_informations(self):
+        combox.addItems(["txt", "csv", "wfb"])        
+
+    def acquisition_config(self):
+        """Cria a thread de aquisição que controla o osciloscópio fora da thread da interface."""
+        logger.debug("Configuring acquisition thread")
+        self.acquisition_thread = QtCore.QThread()
+        self.worker = AcquisitionWorker()
+        self.worker.moveToThread(self.acquisition_thread)
+
+        self.acquisition_thread.started.connect(self.worker.open)
+        self.worker.connected.connect(self.config_informations)
+        self.worker.finished.connect(self.on_request_finished)
+        self.worker.failed.connect(self.on_request_failed)
+        self.worker.frame_ready.connect(self.on_frame_ready)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.stop_acquisition)
+
+    def stop_acquisition(self):
+        """Fecha a porta serial e encerra a thread de aquisição."""
+        logger.debug("Stopping acquisition thread")
+        self.worker.stop_run()
+        if self.acquisition_thread.isRunning():
+            QtCore.QMetaObject.invokeMethod(self.worker, "close", QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+            self.acquisition_thread.quit()
+            self.acquisition_thread.wait()
+
+    def config_informations(self, infos: dict):
         """Configura as informações do dispositivo na interface do usuário."""
         logger.debug("Configuring additional information")
         line_edit = {line.objectName(): line for line in self.ui.findChildren(QLineEdit) if line.objectName()}
-        infos = self.tektronix.device_id()
 
         if not infos:
             logger.error("Infos not found")
@@ -93,16 +285,29 @@ class Main:
     def plot_config(self):
         """Configura o widget de plotagem."""
         logger.debug("Configuring plot settings")
-        plot_graph: PlotWidget = self.ui.findChild(PlotWidget)
-        if plot_graph:
-            plot_graph.setMouseEnabled(x=False, y=False)
+        if self.plot_graph:
+            self.plot_graph.setMouseEnabled(x=False, y=False)
+            # Desenha no máximo alguns pontos por pixel e apenas a parte visível das curvas
+            self.plot_graph.setDownsampling(auto=True, mode='peak')
+            self.plot_graph.setClipToView(True)
             logger.info("PlotWidget configured")
         else:
             logger.error("PlotWidget not found")
 
+    def curve(self, source: str) -> PlotDataItem:
+        """Retorna a curva de uma fonte, criando-a no primeiro uso."""
+        if source not in self.curves:
+            self.curves[source] = self.plot_graph.plot(pen=CURVE_PENS.get(source, "w"), name=source)
+        return self.curves[source]
+
     # Métodos de Apoio
-    def show_waveform(self, waveform: Waveform):
-        """Exibe a waveform no widget de plotagem."""
+    def show_waveform(self, waveform: Waveform, exclusive=True):
+        """
+        Exibe a waveform no widget de plotagem, atualizando a curva da sua fonte.
+
+        Parâmetros:
+            exclusive (bool, opcional): Oculta as curvas das outras fontes.
+        """
         self.waveform_log(waveform)
         if not waveform:
             logger.error("Waveform not found")
@@ -110,23 +315,39 @@ class Main:
 
         self.waveform = waveform
         logger.debug("Displaying waveform")
-        plot_graph: PlotWidget = self.ui.findChild(PlotWidget)
-        if not plot_graph:
+        if not self.plot_graph:
             logger.error("PlotWidget not found")
             return
 
         margin = 10
-        y_upper_limit = waveform.get_voltage_max()
-        y_lower_limit = waveform.get_voltage_min()
-        if y_lower_limit is not None and y_upper_limit is not None:
-            plot_graph.setYRange(y_lower_limit - margin, y_upper_limit + margin)
-
-        curv_data = waveform.process_curv_data()
-        time = waveform.get_time_array()
-
-        plot_graph.plot(time, curv_data)
+        y_range = (waveform.get_voltage_min(), waveform.get_voltage_max())
+        if None not in y_range and y_range != self.y_range:
+            self.plot_graph.setYRange(y_range[0] - margin, y_range[1] + margin)
+            self.y_range = y_range
+
+        source = waveform.get_waveform_data()["CHANNEL"].strip().upper()
+        self.update_curve(source, waveform)
+        if exclusive:
+            for other, item in self.curves.items():
+                if other != source:
+                    item.setVisible(False)
         logger.info("Waveform displayed successfully")
 
+    def update_curve(self, source: str, waveform: Waveform):
+        """Atualiza no lugar a curva de uma fonte com os dados da waveform."""
+        curve = self.curve(source)
+        curve.setData(waveform.get_time_array(), waveform.process_curv_data())
+        curve.setVisible(True)
+
+    def show_frame(self, frame: dict[str, Waveform]):
+        """Exibe juntas as waveforms de um quadro do modo contínuo, ocultando as outras fontes."""
+        for source, waveform in frame.items():
+            self.update_curve(source, waveform)
+        for source, curve in self.curves.items():
+            if source not in frame:
+                curve.setVisible(False)
+        self.waveform = next(reversed(frame.values()))
+
     def writer_console(self, value: str):
         """Escreve um valor na área de texto de resultados, limpando o console antes."""
         self.clear_console()  # Limpa o console antes de escrever
@@ -144,9 +365,9 @@ class Main:
     def clear_waveform(self):
         """Limpa a waveform exibida no widget de plotagem."""
         logger.debug("Clear Waveform button clicked")
-        plot_graph: PlotWidget = self.ui.findChild(PlotWidget)
-        if plot_graph:
-            plot_graph.clear()
+        if self.plot_graph:
+            for curve in self.curves.values():
+                curve.setData([], [])  # Mantém as curvas para as próximas capturas
             logger.info("Waveform cleared")
         else:
             logger.error("PlotWidget not found")
@@ -200,98 +421,93 @@ class Main:
         buttons['Ref2Waveform'].clicked.connect(self.ref2_waveform)
         buttons['Save'].clicked.connect(self.save_waveform)
         buttons['Clear'].clicked.connect(self.clear_all)
+        buttons['Run'].toggled.connect(self.toggle_run)
+        self.run_button: QPushButton = buttons['Run']
 
     def ch1_freq(self):
-        """Exibe a frequência do canal 1 na área de texto de resultados."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a frequência do canal 1."""
         logger.debug("CH1 Frequency button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.writer_console(self.tektronix.ch1_freq())
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+        self.worker.submit("ch1_freq")
 
     def ch2_freq(self):
-        """Exibe a frequência do canal 2 na área de texto de resultados."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a frequência do canal 2."""
         logger.debug("CH2 Frequency button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.writer_console(self.tektronix.ch2_freq())
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+        self.worker.submit("ch2_freq")
 
     def ch1_waveform(self):
-        """Exibe a waveform do canal 1 no widget de plotagem e armazena no atributo."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a waveform do canal 1."""
         logger.debug("CH1 Waveform button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.clear_all()  # Limpa o console e o display antes de exibir a nova waveform
-            self.waveform = self.tektronix.ch1_waveform()  # Armazena a waveform no atributo
-            self.writer_console(str(self.tektronix.event_log()))
-            self.show_waveform(self.waveform)
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+        self.worker.submit("ch1_waveform")
 
     def ch2_waveform(self):
-        """Exibe a waveform do canal 2 no widget de plotagem e armazena no atributo."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a waveform do canal 2."""
         logger.debug("CH2 Waveform button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.clear_all()  # Limpa o console e o display antes de exibir a nova waveform
-            self.waveform = self.tektronix.ch2_waveform()  # Armazena a waveform no atributo
-            self.writer_console(str(self.tektronix.event_log()))
-            self.show_waveform(self.waveform)
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+        self.worker.submit("ch2_waveform")
 
     def math_waveform(self):
-        """Exibe a waveform matemática no widget de plotagem e armazena no atributo."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a waveform matemática."""
         logger.debug("Math Waveform button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.clear_all()  # Limpa o console e o display antes de exibir a nova waveform
-            self.waveform = self.tektronix.math_waveform()  # Armazena a waveform no atributo
-            self.writer_console(str(self.tektronix.event_log()))
-            self.show_waveform(self.waveform)
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+        self.worker.submit("math_waveform")
 
     def ref1_waveform(self):
-        """Exibe a waveform de referência 1 no widget de plotagem e armazena no atributo."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a waveform de referência 1."""
         logger.debug("Ref1 Waveform button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.clear_all()  # Limpa o console e o display antes de exibir a nova waveform
-            self.waveform = self.tektronix.ref1_waveform()  # Armazena a waveform no atributo
-            self.writer_console(str(self.tektronix.event_log()))
-            self.show_waveform(self.waveform)
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+        self.worker.submit("ref1_waveform")
 
     def ref2_waveform(self):
-        """Exibe a waveform de referência 2 no widget de plotagem e armazena no atributo."""
-        if not self.buttons_enabled:
-            return  # Ignora o evento se a flag estiver desativada
+        """Solicita a waveform de referência 2."""
         logger.debug("Ref2 Waveform button clicked")
-        self.buttons_enabled = False  # Desativa a flag
-        try:
-            self.clear_all()  # Limpa o console e o display antes de exibir a nova waveform
-            self.waveform = self.tektronix.ref2_waveform()  # Armazena a waveform no atributo
-            self.writer_console(str(self.tektronix.event_log()))
+        self.worker.submit("ref2_waveform")
+
+    def toggle_run(self, checked: bool):
+        """Inicia ou encerra a captura contínua de CH1 e CH2 (e das referências, se marcado)."""
+        if not checked:
+            self.worker.stop_run()
+            return
+        sources = ["CH1", "CH2"]
+        references: QCheckBox = self.ui.findChild(QCheckBox, name="RunReferences")
+        if references and references.isChecked():
+            sources += ["REF1", "REF2"]
+        self.frames = 0
+        self.rate_records = 0
+        self.rate_time = time.monotonic()
+        self.worker.start_run(sources)
+
+    def on_frame_ready(self):
+        """Exibe o quadro mais recente do modo contínuo e atualiza a taxa de quadros e de registros."""
+        frame = self.worker.take_frame()
+        if not frame or not self.run_button.isChecked():
+            return
+        self.show_frame(frame)
+        self.frames += 1
+
+        elapsed = time.monotonic() - self.rate_time
+        if elapsed >= 0.5:
+            records = self.worker.records
+            label: QLabel = self.ui.findChild(QLabel, name="RunRate")
+            if label:
+                label.setText(f"{self.frames / elapsed:.1f} fps\n"
+                              f"{(records - self.rate_records) / elapsed:.1f} records/s\n"
+                              f"{self.worker.dropped} dropped")
+            self.frames = 0
+            self.rate_records = records
+            self.rate_time = time.monotonic()
+
+    def on_request_finished(self, name: str, result):
+        """Recebe o resultado de um comando executado pela thread de aquisição."""
+        logger.debug(f"Request {name} finished")
+        if name.endswith("_freq"):
+            self.writer_console(str(result))
+        elif name.endswith("_waveform"):
+            self.clear_console()  # A curva da fonte é atualizada no lugar por show_waveform
+            self.waveform = result  # Armazena a waveform no atributo
             self.show_waveform(self.waveform)
-        finally:
-            self.buttons_enabled = True  # Reativa a flag
+
+    def on_request_failed(self, name: str, message: str):
+        """Exibe o erro de um comando executado pela thread de aquisição."""
+        self.writer_console(f"Error in {name}: {message}")
+        if name == "run":
+            self.run_button.setChecked(False)
 
     def save_waveform(self):
         """Salva a waveform atual em um arquivo."""
@@ -329,8 +545,14 @@ class Main:
         self.clear_waveform()
 
 if __name__ == "__main__":
+    startup_time = "--startup-time" in sys.argv
+    configure_logging(file_name=None if startup_time else 'tektronix.log')  # A medida não grava o tektronix.log
     logger.debug("Starting application")
     app = QtWidgets.QApplication(sys.argv)
     main = Main()
-    main.run()
+    if startup_time:
+        # Mede o tempo até a janela ser exibida, imprime em segundos e encerra (usado por benchmarks/startup.py)
+        main.run(on_shown=lambda startup: (print(f"{startup:.6f}"), app.quit()))
+    else:
+        main.run()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+Benchmark do caminho de aquisição, com tempo por etapa.
+
+Mede a captura com Tektronix.ch1_waveform() (escrita serial, espera pela resposta, transferência,
+verificações de *ESR? e processamento do driver), a construção e a conversão da Waveform, a
+geração do bitmap e a gravação e leitura de arquivos, para vários tamanhos de registro.
+Por padrão usa o SimulatedTDS340A; com --port, usa o osciloscópio real.
+
+Uso:
+    python -m benchmarks.acquisition --sizes 100 500 1000 --iterations 10 --output bench.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import numpy as np
+from serial import Serial
+
+from src import Tektronix, Waveform, WaveformPlot, WaveformRenderer, SimulatedTDS340A
+
+
+class TimedTransport:
+    """
+    Envolve um transporte serial e acumula o tempo gasto em cada etapa da comunicação.
+
+    Etapas: 'write' (escrita), 'wait' (até o primeiro byte da resposta chegar), 'transfer'
+    (leitura da resposta) e 'esr' (escrita e leitura das verificações de *ESR? e ALLE?).
+    Os bytes lidos são contados aqui, então a vazão é medida também com um serial.Serial.
+    """
+    def __init__(self, transport):
+        self._transport = transport
+        self._esr = False
+        self.stages = {}
+        self.bytes_read = 0
+
+    def __getattr__(self, name):
+        return getattr(self._transport, name)
+
+    def reset(self):
+        self.stages = dict.fromkeys(('write', 'wait', 'transfer', 'esr'), 0.0)
+        self.bytes_read = 0
+
+    def _add(self, stage: str, start: float):
+        stage = 'esr' if self._esr else stage
+        self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - start
+
+    def _wait_first_byte(self):
+        start = time.perf_counter()
+        deadline = start + (self._transport.timeout or 0)
+        while not self._transport.in_waiting and time.perf_counter() < deadline:
+            time.sleep(0.0002)
+        self._add('wait', start)
+
+    def write(self, data: bytes) -> int:
+        start = time.perf_counter()
+        self._esr = b'*ESR?' in data or b'ALLE?' in data
+        written = self._transport.write(data)
+        self._add('write', start)
+        return written
+
+    def _read(self, method, *args):
+        if not self._transport.in_waiting:
+            self._wait_first_byte()
+        start = time.perf_counter()
+        data = method(*args)
+        self._add('transfer', start)
+        self.bytes_read += data if isinstance(data, int) else len(data)  # readinto retorna o número de bytes
+        return data
+
+    def read(self, size=1):
+        return self._read(self._transport.read, size)
+
+    def readline(self):
+        return self._read(self._transport.readline)
+
+    def read_until(self, expected=b'\n', size=None):
+        return self._read(self._transport.read_until, expected, size)
+
+    def readinto(self, buffer):
+        return self._read(self._transport.readinto, buffer)
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Resumo de uma lista de tempos, em segundos."""
+    values = np.asarray(samples, dtype=np.float64)
+    return {
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def timed(function, *args, **kwargs) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def bench_acquisition(tektronix: Tektronix, transport: TimedTransport, points: int, iterations: int) -> dict:
+    """Mede Tektronix.ch1_waveform() com um registro de `points` pontos."""
+    tektronix.set_window(1, points)
+    tektronix.ch1_waveform()  # Aquece os caches de configuração e de preâmbulo
+
+    stages = {name: [] for name in ('write', 'wait', 'transfer', 'esr', 'driver', 'total')}
+    received = 0
+    for _ in range(iterations):
+        transport.reset()
+        total, waveform = timed(tektronix.ch1_waveform)
+        if waveform is None:
+            raise RuntimeError("Falha na captura durante o benchmark")
+        received += transport.bytes_read
+        for name, value in transport.stages.items():
+            stages[name].append(value)
+        stages['driver'].append(total - sum(transport.stages.values()))
+        stages['total'].append(total)
+
+    elapsed = sum(stages['total'])
+    return {
+        "benchmark": "acquisition",
+        "points": points,
+        "iterations": iterations,
+        "stages": {name: percentiles(values) for name, values in stages.items()},
+        "throughput": {
+            "records_per_s": iterations / elapsed,
+            "points_per_s": iterations * points / elapsed,
+            "bytes_per_s": received / elapsed,
+        },
+    }
+
+
+def synthetic_waveform(points: int, output_dir: str) -> Waveform:
+    """Cria uma Waveform binária de `points` pontos, sem instrumento."""
+    preamble = (f'2;16;BIN;RI;MSB;"Ch1, DC coupling, 1.0E0 V/div, 5.0E-4 s/div, {points} points, Sample mode";'
+                f'{points};Y;"s";5.0E-6;500;"V";1.5625E-4;0.0E0;0.0E0')
+    samples = (np.sin(np.linspace(0, 20 * np.pi, points)) * 20000).astype('>i2')
+    return Waveform(preamble, samples.tobytes(), output_dir=output_dir)
+
+
+def bench_processing(points: int, iterations: int, output_dir: str, plot: bool) -> dict:
+    """Mede construção, conversão, bitmap, gravação e leitura de uma Waveform de `points` pontos."""
+    source = synthetic_waveform(points, output_dir)
+    renderer = WaveformRenderer()  # Reutilizado entre as iterações, como na exportação em massa
+    stages = {name: [] for name in ('parse', 'convert', 'save', 'load')}
+    if plot:
+        stages['plot'] = []
+
+    for index in range(iterations):
+        duration, waveform = timed(Waveform, source.raw_data, source.curv_data, output_dir=output_dir)
+        stages['parse'].append(duration)
+
+        start = time.perf_counter()
+        waveform.process_curv_data()
+        waveform.get_time_array()
+        stages['convert'].append(time.perf_counter() - start)
+
+        name = f"bench_{points}_{index}"
+        stages['save'].append(timed(waveform.save_to_file, 'txt', name=name, output_dir=output_dir)[0])
+        path = os.path.join(output_dir, f"{name}.txt")
+        stages['load'].append(timed(lambda: Waveform.from_file(path).process_curv_data())[0])
+        os.remove(path)
+
+        if plot:
+            plotter = WaveformPlot(waveform, renderer)
+            stages['plot'].append(timed(plotter.get_bitmap)[0])
+
+    return {
+        "benchmark": "processing",
+        "points": points,
+        "iterations": iterations,
+        "stages": {name: percentiles(values) for name, values in stages.items()},
+        "throughput": {
+            "points_per_s": points / np.mean(stages['convert']),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do caminho de aquisição do Tektronix 340A")
+    parser.add_argument('--port', help="Porta serial do osciloscópio real. Sem ela, usa o simulador.")
+    parser.add_argument('--baudrate', type=int, default=19200)
+    parser.add_argument('--encoding', default='RIB', choices=Tektronix.ENCODINGS)
+    parser.add_argument('--width', type=int, default=2, choices=(1, 2))
+    parser.add_argument('--latency', type=float, default=0.005, help="Latência do simulador, em segundos")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000],
+                        help="Tamanhos de registro capturados do instrumento")
+    parser.add_argument('--processing-sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Tamanhos de registro usados nas etapas sem instrumento")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--no-plot', action='store_true', help="Não mede a geração do bitmap")
+    parser.add_argument('--output', help="Arquivo JSON de saída. Padrão: saída padrão.")
+    args = parser.parse_args(argv)
+
+    if args.port:
+        link = Serial(args.port, baudrate=args.baudrate, timeout=5)
+    else:
+        link = SimulatedTDS340A(baudrate=args.baudrate, latency=args.latency, timeout=5, seed=0)
+    transport = TimedTransport(link)
+    tektronix = Tektronix(transport=transport, encoding=args.encoding, width=args.width)
+
+    results = []
+    for points in args.sizes:
+        results.append(bench_acquisition(tektronix, transport, points, args.iterations))
+        print(f"acquisition {points:>7} pontos: {results[-1]['stages']['total']['p50'] * 1e3:9.2f} ms (p50)",
+              file=sys.stderr)
+    tektronix.close_port()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for points in args.processing_sizes:
+            results.append(bench_processing(points, args.iterations, output_dir, not args.no_plot))
+            print(f"processing  {points:>7} pontos: {results[-1]['stages']['convert']['p50'] * 1e3:9.2f} ms (p50)",
+                  file=sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "target": args.port or "simulator",
+        "baudrate": args.baudrate,
+        "encoding": args.encoding,
+        "width": args.width,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark do tempo de inicialização.
+
+Mede, em processos novos, o tempo de importação do pacote e de cada módulo principal e o tempo
+até a janela do app.py ser exibida (app.py --startup-time). Sem display, a interface usa a
+plataforma Qt 'offscreen'.
+
+Uso:
+    python -m benchmarks.startup --iterations 10 --output startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import numpy as np
+
+from benchmarks.acquisition import percentiles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Nome -> código importado em um interpretador novo
+IMPORTS = {
+    "import src": "import src",
+    "from src import Waveform": "from src import Waveform",
+    "from src import Tektronix": "from src import Tektronix",
+    "from src import CaptureFile": "from src import CaptureFile",
+}
+
+
+def bench_import(code: str, iterations: int) -> dict:
+    """Tempo de `python -c code` menos o de `python -c pass` (inicialização do interpretador)."""
+    def run(source: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', source], cwd=ROOT, check=True)
+        return time.perf_counter() - start
+
+    baseline = [run('pass') for _ in range(iterations)]
+    samples = [run(code) for _ in range(iterations)]
+    return {
+        "benchmark": "import",
+        "code": code,
+        "iterations": iterations,
+        "interpreter": percentiles(baseline),
+        "import": percentiles(np.subtract(samples, np.median(baseline))),
+    }
+
+
+def bench_app(iterations: int) -> dict:
+    """Tempo até a janela principal ser exibida, medido pelo próprio app.py."""
+    env = dict(os.environ)
+    if not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    samples = []
+    for _ in range(iterations):
+        output = subprocess.run([sys.executable, 'app.py', '--startup-time'], cwd=ROOT, env=env, check=True,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+        samples.append(float(output.split()[-1]))
+    return {
+        "benchmark": "app",
+        "iterations": iterations,
+        "platform": env.get('QT_QPA_PLATFORM', 'default'),
+        "window_shown": percentiles(samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização do Tektronix 340A")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--no-app', action='store_true', help="Não mede a inicialização do app.py")
+    parser.add_argument('--output', help="Arquivo JSON de saída. Padrão: saída padrão.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, code in IMPORTS.items():
+        results.append(bench_import(code, args.iterations))
+        print(f"{name:<28}: {results[-1]['import']['p50'] * 1e3:9.2f} ms (p50)", file=sys.stderr)
+    if not args.no_app:
+        results.append(bench_app(args.iterations))
+        print(f"{'app.py (janela exibida)':<28}: {results[-1]['window_shown']['p50'] * 1e3:9.2f} ms (p50)",
+              file=sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
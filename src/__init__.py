@@ -1,2 +1,37 @@
-from .tektronix import Tektronix
-from .waveform import Waveform, WaveformPlot
\ No newline at end of file
+"""
+Driver, simulador e ferramentas para o osciloscópio Tektronix TDS 340A.
+
+Os módulos são carregados no primeiro acesso a cada nome (por exemplo, `from src import Waveform`
+não carrega a comunicação serial), o que reduz o tempo de inicialização da aplicação.
+"""
+import importlib
+
+# Nome exportado -> módulo que o define
+_EXPORTS = {
+    "Tektronix": ".tektronix",
+    "TektronixError": ".tektronix",
+    "Waveform": ".waveform",
+    "WaveformPlot": ".waveform",
+    "WaveformRenderer": ".render",
+    "RingBuffer": ".util",
+    "LinkMetrics": ".util",
+    "configure_logging": ".util",
+    "SimulatedTDS340A": ".simulator",
+    "AsyncTektronix": ".async_tektronix",
+    "TektronixManager": ".manager",
+    "CaptureFile": ".capture",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # Os próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
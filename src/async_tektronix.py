@@ -0,0 +1,325 @@
+import time
+import asyncio
+import logging
+from serial import Serial, EIGHTBITS, STOPBITS_ONE, SerialException
+from .tektronix import Tektronix, TektronixError
+from .waveform import Waveform
+
+logger = logging.getLogger('AsyncTektronix')
+
+
+class AsyncTektronix:
+    """
+    Cliente asyncio para o Tektronix TDS 340A.
+
+    A porta serial é aberta em modo não bloqueante (timeout=0): as leituras aguardam a porta ficar
+    legível pelo loop de eventos (add_reader) ou, quando o transporte não tem descritor de arquivo
+    (Windows, simulador), consultam a porta em intervalos curtos. Assim, vários osciloscópios podem
+    ser controlados de um único processo, sem uma thread por instrumento. Os comandos seguem o
+    mesmo protocolo do Tektronix: lotes em uma única escrita, *ESR? ao final e cache de configurações.
+    """
+    def __init__(self, port: str | None = None, baudrate=19200, bytesize=EIGHTBITS, stopbits=STOPBITS_ONE,
+                 encoding='RIB', width=2, start=1, stop=Tektronix.RECORD_LENGTH, stride=1, timeout=1.0,
+                 poll_interval=0.002, transport=None):
+        """
+        Parâmetros:
+            port (str, opcional): Porta serial do osciloscópio. Use AsyncTektronix.open() para procurá-la.
+            start, stop, stride (int, opcional): Janela do registro e decimação, como em Tektronix.set_window().
+            timeout (float, opcional): Tempo máximo, em segundos, sem receber bytes durante uma leitura.
+            poll_interval (float, opcional): Intervalo de consulta quando a porta não tem descritor de arquivo.
+            transport (opcional): Objeto com a interface de serial.Serial usado no lugar da porta.
+        """
+        if transport is not None:
+            self.__ser = transport
+            self.__ser.timeout = 0
+            if not self.__ser.is_open:
+                self.__ser.open()
+        else:
+            self.__ser = Serial(port, baudrate=baudrate, bytesize=bytesize, stopbits=stopbits, timeout=0)
+        if encoding not in Tektronix.ENCODINGS:
+            raise ValueError(f"Codificação inválida: {encoding}. Use {', '.join(Tektronix.ENCODINGS)}")
+        if width not in (1, 2):
+            raise ValueError("A largura dos dados deve ser 1 ou 2 bytes")
+        self.encoding = encoding
+        self.width = width
+        self.set_window(start, stop, stride)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.__buffer = bytearray()
+        self.__settings: dict[str, str] = {}
+        self.__preambles: dict[tuple, tuple[str, str]] = {}  # Mesmo cache de preâmbulos do Tektronix
+        self.__lock = asyncio.Lock()
+        logger.info('Objeto AsyncTektronix inicializado')
+
+    @classmethod
+    async def open(cls, port: str | None = None, **kwargs) -> 'AsyncTektronix':
+        """Cria o cliente, procurando o osciloscópio em paralelo nas portas seriais se `port` não for informada."""
+        if port is None:
+            serial_config = {key: kwargs[key] for key in ('baudrate', 'bytesize', 'stopbits') if key in kwargs}
+            devices = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: Tektronix.probe_ports(first_only=True, **serial_config))
+            if not devices:
+                raise TektronixError("Nenhum ociloscópio Tektronix foi encontrado")
+            port = next(iter(devices))
+        return cls(port, **kwargs)
+
+    @property
+    def binary(self) -> bool:
+        return self.encoding != 'ASCI'
+
+    def set_window(self, start=1, stop=Tektronix.RECORD_LENGTH, stride=1):
+        """Define a janela do registro transferida pelo CURV? e a decimação, como Tektronix.set_window()."""
+        Tektronix._check_window(start, stop, stride)
+        self.start = start
+        self.stop = stop
+        self.stride = stride
+
+    def reset_preamble_cache(self):
+        """Descarta os preâmbulos (WFMPR?) em cache, forçando uma nova consulta na próxima captura."""
+        self.__preambles.clear()
+
+    async def close(self):
+        if self.__ser.isOpen():
+            self.__ser.close()
+            logger.info('Porta serial fechada')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    # Leitura não bloqueante
+    def __fileno(self) -> int | None:
+        try:
+            return self.__ser.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    async def __wait_readable(self, timeout: float):
+        """Aguarda a porta ter bytes disponíveis, por no máximo `timeout` segundos."""
+        fd = self.__fileno()
+        if fd is not None:
+            loop = asyncio.get_running_loop()
+            ready = loop.create_future()
+            try:
+                loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+            except NotImplementedError:
+                fd = None
+            else:
+                try:
+                    await asyncio.wait_for(ready, timeout)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    loop.remove_reader(fd)
+                return
+        await asyncio.sleep(min(self.poll_interval, timeout))
+
+    async def __fill(self, deadline: float) -> float:
+        """Lê os bytes disponíveis para o buffer interno; retorna o novo prazo da leitura."""
+        data = self.__ser.read(self.__ser.in_waiting or 1)
+        if data:
+            self.__buffer += data
+            return time.monotonic() + self.timeout  # O prazo conta a partir do último byte recebido
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TektronixError("Tempo esgotado aguardando a resposta do instrumento")
+        await self.__wait_readable(remaining)
+        return deadline
+
+    async def __read_until(self, terminator=b'\n') -> bytes:
+        deadline = time.monotonic() + self.timeout
+        while (index := self.__buffer.find(terminator)) < 0:
+            deadline = await self.__fill(deadline)
+        data = bytes(self.__buffer[:index + len(terminator)])
+        del self.__buffer[:index + len(terminator)]
+        return data
+
+    async def __read_exactly(self, size: int) -> bytearray:
+        deadline = time.monotonic() + self.timeout
+        while len(self.__buffer) < size:
+            deadline = await self.__fill(deadline)
+        data = self.__buffer[:size]
+        del self.__buffer[:size]
+        return data
+
+    async def discard_input(self, quiet: float | None = None) -> int:
+        """
+        Descarta o restante de uma resposta interrompida, esperando a linha ficar em silêncio, como
+        Tektronix.discard_input(); retorna o número de bytes descartados.
+        """
+        if quiet is None:
+            quiet = 0.05 + 1000 / self.__ser.baudrate
+        discarded = len(self.__buffer)
+        self.__buffer.clear()
+        try:
+            deadline = time.monotonic() + quiet
+            while (remaining := deadline - time.monotonic()) > 0:
+                data = self.__ser.read(self.__ser.in_waiting or 1)
+                if data:
+                    discarded += len(data)
+                    deadline = time.monotonic() + quiet
+                else:
+                    await self.__wait_readable(remaining)
+            self.__ser.reset_input_buffer()
+        except (SerialException, OSError) as e:
+            logger.debug(f'Falha ao descartar a entrada: {e}')
+        if discarded:
+            logger.warning(f'{discarded} bytes de uma resposta interrompida descartados')
+        return discarded
+
+    async def read_response(self) -> str:
+        return (await self.__read_until(b'\n')).decode()
+
+    async def read_block(self) -> bytearray:
+        """Lê um bloco binário no formato IEEE 488.2 (#<n><tamanho><dados>)."""
+        header = await self.__read_exactly(2)
+        if header[:1] != b'#' or not header[1:2].isdigit():
+            raise TektronixError(f"Cabeçalho de bloco binário inválido: {bytes(header)!r}")
+        length = int(await self.__read_exactly(int(header[1:2])))
+        data = await self.__read_exactly(length)
+        await self.__read_until(b'\n')  # Consome o terminador de linha após o bloco
+        return data
+
+    # Comandos
+    async def command(self, command: str) -> str:
+        res = await self.commands([command])
+        return res[0] if res else ''
+
+    async def commands(self, commands: list[str]) -> list:
+        """Versão assíncrona de Tektronix.commands(); lotes de tarefas concorrentes não se intercalam."""
+        for cmd in commands:
+            if not isinstance(cmd, str):
+                raise TypeError("The command must be a str")
+
+        async with self.__lock:
+            self.__buffer.clear()
+            out_list = []
+            pending = []
+            written = {}
+            try:
+                for cmd in commands:
+                    if cmd.strip().upper().lstrip(':').startswith('*RST'):
+                        self.__settings.clear()
+                        written.clear()  # As configurações anteriores do lote também voltam ao padrão
+                    setting = Tektronix._setting(cmd)
+                    if setting:
+                        header, value = setting
+                        if written.get(header, self.__settings.get(header)) == value:
+                            continue
+                        written[header] = value
+                    pending.append(cmd)
+                    if not Tektronix.is_query(cmd):
+                        continue
+                    self.__ser.write(Tektronix.join_commands(pending))
+                    pending = []
+                    if self.binary and cmd.strip().upper().lstrip(':') in ('CURV?', 'CURVE?'):
+                        out = await self.read_block()
+                    else:
+                        out = (await self.read_response()).strip()
+                    if out:
+                        out_list.append(out)
+
+                self.__ser.write(Tektronix.join_commands(pending + ["*ESR?"]))
+                error = (await self.read_response()).strip()
+                if error and error != "0":
+                    self.__ser.write(b"ALLE?\n")
+                    error_details = (await self.read_response()).strip()
+                    raise TektronixError(f"Erro ao executar '{'; '.join(commands)}': ({error}) {error_details}")
+                self.__settings.update(written)
+                return out_list
+            except Exception:
+                self.__settings.clear()  # Não se sabe quais configurações foram aplicadas
+                await self.discard_input()  # O restante da resposta não pode ser lido pela próxima troca
+                raise
+
+    async def device_id(self):
+        res = await self.command('ID?')
+        if res:
+            device_info = Tektronix.parse_device_id(res)
+            logger.info(f'Informações do dispositivo: {device_info}')
+            return device_info
+        logger.warning('Falha ao obter informações do dispositivo')
+        return None
+
+    async def __freq(self, source: str):
+        res = await self.commands([
+            f"MEASU:IMM:SOURCE {source}",
+            "MEASU:IMM:TYPE FREQ",
+            "MEASU:IMM:VAL?"
+        ])
+        return res[0] if res else None
+
+    async def ch1_freq(self):
+        logger.info('Obtendo frequência do canal 1')
+        return await self.__freq('CH1')
+
+    async def ch2_freq(self):
+        logger.info('Obtendo frequência do canal 2')
+        return await self.__freq('CH2')
+
+    async def acquire(self, sources=('CH1', 'CH2'), freeze: bool | None = None) -> dict[str, Waveform]:
+        """
+        Captura várias fontes em uma única sequência de comandos, como Tektronix.acquire().
+
+        Com `freeze`, a aquisição é parada durante a leitura, então todas as fontes vêm do mesmo
+        evento de disparo; o estado anterior é restaurado ao final. A janela é a de set_window() e o
+        preâmbulo fica em cache como no Tektronix, validado pela consulta curta às escalas.
+        """
+        sources = Tektronix._check_sources(sources)
+        if freeze is None:
+            freeze = len(sources) > 1
+        data_setup = lambda source: Tektronix._data_commands(source, self.encoding, self.width, self.start, self.stop)
+        # Estado consultado antes do STOP, como em Tektronix.acquire()
+        running = freeze and Tektronix._is_running(await self.command("ACQ:STATE?"))
+        batch = Tektronix._acquire_batch(sources, running, data_setup)
+
+        try:
+            res = await self.commands(batch)
+            if len(res) != len(sources) * 2:
+                logger.warning(f'Resposta incompleta ao capturar {sources}')
+                return {}
+
+            curves = dict(zip(sources, res[1::2]))
+            keys = {source: (source, self.encoding, self.width, self.start, self.stop) for source in sources}
+            preambles, stale = Tektronix._cached_preambles(self.__preambles, keys, res[::2])
+            if stale:
+                res = await self.commands(Tektronix._preamble_batch(stale))
+                if len(res) != len(stale):
+                    logger.warning(f'Falha ao obter o preâmbulo de {list(stale)}')
+                    return {}
+                Tektronix._store_preambles(self.__preambles, preambles, stale, res)
+        finally:
+            if running:
+                try:
+                    await self.commands(["ACQ:STATE RUN"])
+                except TektronixError as e:
+                    logger.error(f'Falha ao retomar a aquisição: {e}')
+
+        return {
+            source: Waveform(preambles[source], curves[source], start=self.start, stride=self.stride)
+            for source in sources
+        }
+
+    async def __waveform(self, source: str, description: str):
+        logger.info(f'Obtendo waveform {description}')
+        waveform = (await self.acquire([source], freeze=False)).get(source)
+        if not waveform:
+            logger.warning(f'Falha ao obter waveform {description}')
+        return waveform
+
+    async def ch1_waveform(self):
+        return await self.__waveform('CH1', 'do canal 1')
+
+    async def ch2_waveform(self):
+        return await self.__waveform('CH2', 'do canal 2')
+
+    async def math_waveform(self):
+        return await self.__waveform('MATH', 'matemática')
+
+    async def ref1_waveform(self):
+        return await self.__waveform('REF1', 'de referência 1')
+
+    async def ref2_waveform(self):
+        return await self.__waveform('REF2', 'de referência 2')
@@ -0,0 +1,330 @@
+"""
+Processamento em lote de arquivos de waveform (.txt, .csv e .wfb) salvos por Waveform.save_to_file().
+
+Os arquivos de um diretório (e de seus subdiretórios) são processados em paralelo por um pool de
+processos, e os resultados são gravados em ordem, à medida que ficam prontos, em uma única saída.
+O progresso é exibido na saída de erro.
+
+Uso:
+    python -m src.batch convert waveform_data --to wfb --output-dir convertidos
+    python -m src.batch summarize waveform_data --output resumo.csv
+    python -m src.batch export waveform_data --output arquivo.wfc
+    python -m src.batch index waveform_data --output indice.csv
+    python -m src.batch thumbnails waveform_data --output-dir miniaturas --size 320x240
+"""
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from .waveform import Waveform, FILE_FORMATS
+from .capture import CaptureFile
+from .render import WaveformRenderer
+from .util import configure_logging
+
+SUMMARY_FIELDS = ("file", "channel", "points", "min", "max", "mean", "rms", "frequency", "error")
+INDEX_FIELDS = ("file", "channel", "coupling", "volts_per_div", "seconds_per_div", "points", "start", "stride",
+                "x_increment", "error")
+
+
+def find_files(root: str, formats=FILE_FORMATS) -> list[str]:
+    """Lista os arquivos de waveform de um diretório e de seus subdiretórios, em ordem alfabética."""
+    if os.path.isfile(root):
+        return [root]
+    extensions = tuple(f'.{file_format}' for file_format in formats)
+    files = []
+    for directory, _, names in os.walk(root):
+        files.extend(os.path.join(directory, name) for name in names if name.endswith(extensions))
+    return sorted(files)
+
+
+def frequency(waveform: Waveform, hysteresis=0.1) -> float | None:
+    """
+    Estima a frequência pelas passagens ascendentes pelo valor médio da forma de onda.
+
+    Uma passagem só conta depois que o sinal sai de uma faixa em torno da média (`hysteresis`
+    vezes o pico a pico, e ao menos alguns níveis do conversor), para o ruído perto da média
+    não gerar bordas falsas.
+    """
+    voltage = waveform.process_curv_data()
+    if voltage is None or len(voltage) < 3:
+        return None
+    mean = voltage.mean()
+    band = max(hysteresis * (voltage.max() - voltage.min()), 4 * waveform.parsed_data["YINCREMENT"]) / 2
+    # +1 acima da faixa, -1 abaixo; uma borda é a primeira amostra acima depois de uma abaixo
+    state = np.where(voltage >= mean + band, 1, np.where(voltage <= mean - band, -1, 0))
+    outside = np.flatnonzero(state)
+    levels = state[outside]
+    rising = outside[1:][(levels[:-1] < 0) & (levels[1:] > 0)]
+    if len(rising) < 2:
+        return None
+    time_array = waveform.get_time_array()
+    return (len(rising) - 1) / (time_array[rising[-1]] - time_array[rising[0]])
+
+
+def summarize(waveform: Waveform) -> dict:
+    """Resumo de uma waveform: número de pontos, tensões mínima, máxima, média e RMS, e frequência."""
+    voltage = waveform.process_curv_data()
+    summary = {"channel": waveform.get_waveform_data()["CHANNEL"], "points": 0}
+    if voltage is None or len(voltage) == 0:
+        return summary
+    summary.update({
+        "points": len(voltage),
+        "min": float(voltage.min()),
+        "max": float(voltage.max()),
+        "mean": float(voltage.mean()),
+        "rms": float(np.sqrt(np.mean(np.square(voltage)))),
+        "frequency": frequency(waveform),
+    })
+    return summary
+
+
+# Tarefas executadas nos processos do pool; retornam resultados simples, que podem ser serializados
+_renderer: WaveformRenderer | None = None  # Um renderizador por processo, reutilizado entre os arquivos
+
+
+def _init_worker(level: int):
+    logging.getLogger().setLevel(level)
+
+
+def _thumbnail_task(task: tuple[str, str, int, int]) -> dict:
+    global _renderer
+    file_name, output_path, width, height = task
+    try:
+        if _renderer is None or (_renderer.width, _renderer.height) != (width, height):
+            _renderer = WaveformRenderer(width, height)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        if not _renderer.save(Waveform.from_file(file_name), output_path):
+            return {"file": file_name, "error": "Nenhum dado CURV? disponível"}
+        return {"file": file_name}
+    except Exception as e:
+        return {"file": file_name, "error": str(e)}
+
+
+def _summarize_task(file_name: str) -> dict:
+    try:
+        return {"file": file_name, **summarize(Waveform.from_file(file_name))}
+    except Exception as e:
+        return {"file": file_name, "error": str(e)}
+
+
+def _index_task(file_name: str) -> dict:
+    try:
+        waveform = Waveform.from_file(file_name, lazy=True)  # Lê apenas o preâmbulo e a janela
+        info = waveform.get_waveform_data()
+        return {
+            "file": file_name,
+            "channel": info["CHANNEL"],
+            "coupling": info["COUPLING"].strip(),
+            "volts_per_div": info["VOLTAGE_PER_DIVISION"].strip(),
+            "seconds_per_div": info["TIME_PER_DIVISION"].strip(),
+            "points": waveform.parsed_data["NUM_POINTS"],
+            "start": waveform.start,
+            "stride": waveform.stride,
+            "x_increment": waveform.parsed_data["XINCREMENT"],
+        }
+    except Exception as e:
+        return {"file": file_name, "error": str(e)}
+
+
+def _convert_task(task: tuple[str, str, str, str]) -> dict:
+    file_name, output_dir, name, file_format = task
+    try:
+        Waveform.from_file(file_name).save_to_file(file_format, name=name, output_dir=output_dir)
+        return {"file": file_name}
+    except Exception as e:
+        return {"file": file_name, "error": str(e)}
+
+
+def _export_task(file_name: str) -> dict:
+    try:
+        waveform = Waveform.from_file(file_name)
+        return {
+            "file": file_name,
+            "wfmpr": waveform.raw_data,
+            "curv": waveform._wfb_samples(),
+            "start": waveform.start,
+            "stride": waveform.stride,
+            "timestamp": os.path.getmtime(file_name),
+        }
+    except Exception as e:
+        return {"file": file_name, "error": str(e)}
+
+
+class Progress:
+    """Exibe o andamento do lote na saída de erro, no máximo algumas vezes por segundo."""
+    def __init__(self, total: int, interval=0.5, stream=sys.stderr):
+        self.total = total
+        self.done = 0
+        self.errors = 0
+        self.interval = interval
+        self.stream = stream
+        self._start = self._last = time.monotonic()
+
+    def update(self, result: dict):
+        self.done += 1
+        if result.get("error"):
+            self.errors += 1
+            print(f"\nErro em {result['file']}: {result['error']}", file=self.stream)
+        now = time.monotonic()
+        if now - self._last >= self.interval or self.done == self.total:
+            self._last = now
+            rate = self.done / max(now - self._start, 1e-9)
+            print(f"\r{self.done}/{self.total} arquivos ({rate:.1f}/s, {self.errors} erros)",
+                  end='\n' if self.done == self.total else '', file=self.stream, flush=True)
+
+
+def run(task, items: list, jobs: int | None, level: int, progress: Progress):
+    """Executa `task` sobre os itens no pool de processos, produzindo os resultados na ordem dos itens."""
+    if jobs == 1:
+        _init_worker(level)
+        results = map(task, items)
+        for result in results:
+            progress.update(result)
+            yield result
+        return
+    jobs = jobs or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(items) // (4 * jobs)))  # Menos trocas entre processos em lotes grandes
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(level,)) as executor:
+        for result in executor.map(task, items, chunksize=chunksize):
+            progress.update(result)
+            yield result
+
+
+def write_results(args, task, fields, files: list[str], level: int) -> int:
+    """
+    Executa `task` sobre os arquivos e grava os resultados, em ordem, em CSV ou JSON Lines.
+    Retorna 1 se algum arquivo falhou, como os demais comandos.
+    """
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    progress = Progress(len(files))
+    try:
+        if args.format == 'csv':
+            writer = csv.DictWriter(output, fieldnames=fields)
+            writer.writeheader()
+        for result in run(task, files, args.jobs, level, progress):
+            if args.format == 'csv':
+                writer.writerow(result)
+            else:
+                output.write(json.dumps(result) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if progress.errors else 0
+
+
+def command_summarize(args, files: list[str], level: int) -> int:
+    return write_results(args, _summarize_task, SUMMARY_FIELDS, files, level)
+
+
+def command_index(args, files: list[str], level: int) -> int:
+    return write_results(args, _index_task, INDEX_FIELDS, files, level)
+
+
+def command_convert(args, files: list[str], level: int) -> int:
+    root = args.path if os.path.isdir(args.path) else os.path.dirname(args.path)
+    tasks = []
+    outputs = {}
+    errors = 0
+    for file_name in files:
+        if file_name.endswith(f'.{args.to}') and not args.output_dir:
+            continue  # Já está no formato pedido
+        relative_dir = os.path.relpath(os.path.dirname(file_name), root)
+        output_dir = os.path.normpath(os.path.join(args.output_dir or root, relative_dir))
+        # A extensão de origem fica no nome (w0.txt -> w0.txt.wfb), para w0.txt, w0.csv e w0.wfb
+        # não gravarem o mesmo arquivo
+        name = os.path.basename(file_name)
+        if name.endswith(f'.{args.to}'):
+            name = name[:-len(args.to) - 1]
+        output_path = os.path.join(output_dir, f"{name}.{args.to}")
+        if output_path in outputs:
+            errors += 1
+            print(f"Erro em {file_name}: {output_path} já é a saída de {outputs[output_path]}", file=sys.stderr)
+            continue
+        outputs[output_path] = file_name
+        tasks.append((file_name, output_dir, name, args.to))
+    errors += sum(bool(result.get("error")) for result in run(_convert_task, tasks, args.jobs, level, Progress(len(tasks))))
+    return 1 if errors else 0
+
+
+def command_thumbnails(args, files: list[str], level: int) -> int:
+    root = args.path if os.path.isdir(args.path) else os.path.dirname(args.path)
+    width, height = map(int, args.size.lower().split('x'))
+    tasks = []
+    for file_name in files:
+        # A extensão de origem fica no nome (w0.txt.png), para cada formato de uma captura ter sua imagem
+        name = os.path.relpath(file_name, root)
+        tasks.append((file_name, os.path.join(args.output_dir, f"{name}.{args.format}"), width, height))
+    errors = sum(bool(result.get("error")) for result in run(_thumbnail_task, tasks, args.jobs, level, Progress(len(tasks))))
+    return 1 if errors else 0
+
+
+def command_export(args, files: list[str], level: int) -> int:
+    # Os registros são gravados na ordem de modificação dos arquivos, para a busca por tempo do CaptureFile
+    files = sorted(files, key=os.path.getmtime)
+    progress = Progress(len(files))
+    with CaptureFile(args.output) as capture:
+        for result in run(_export_task, files, args.jobs, level, progress):
+            if not result.get("error"):
+                waveform = Waveform(result["wfmpr"], result["curv"], start=result["start"], stride=result["stride"])
+                capture.append(waveform, result["timestamp"])
+    return 1 if progress.errors else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Processamento em lote de arquivos de waveform do Tektronix 340A")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Número de processos. Padrão: número de CPUs.")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Exibe os logs de cada arquivo")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help="Converte os arquivos para outro formato")
+    convert.add_argument('path')
+    convert.add_argument('--to', default='wfb', choices=FILE_FORMATS)
+    convert.add_argument('--output-dir', help="Diretório de saída, com a mesma estrutura de subdiretórios. "
+                                              "Padrão: ao lado de cada arquivo.")
+
+    summary = commands.add_parser('summarize', help="Resume cada arquivo (mínimo, máximo, RMS, frequência)")
+    summary.add_argument('path')
+    summary.add_argument('--output', help="Arquivo de saída. Padrão: saída padrão.")
+    summary.add_argument('--format', default='csv', choices=('csv', 'jsonl'))
+
+    index = commands.add_parser('index', help="Lista os metadados de cada arquivo sem ler os pontos")
+    index.add_argument('path')
+    index.add_argument('--output', help="Arquivo de saída. Padrão: saída padrão.")
+    index.add_argument('--format', default='csv', choices=('csv', 'jsonl'))
+
+    thumbnails = commands.add_parser('thumbnails', help="Gera uma imagem de cada arquivo")
+    thumbnails.add_argument('path')
+    thumbnails.add_argument('--output-dir', required=True, help="Diretório das imagens, com a mesma estrutura de subdiretórios")
+    thumbnails.add_argument('--size', default='320x240', help="Largura x altura, em pixels")
+    thumbnails.add_argument('--format', default='png', choices=('png', 'bmp'))
+
+    export = commands.add_parser('export', help="Exporta os arquivos para um único arquivo de captura (.wfc)")
+    export.add_argument('path')
+    export.add_argument('--output', required=True)
+
+    args = parser.parse_args(argv)
+    level = logging.INFO if args.verbose else logging.WARNING
+    configure_logging(level, file_name=None)
+
+    files = find_files(args.path)
+    if not files:
+        print(f"Nenhum arquivo de waveform encontrado em {args.path}", file=sys.stderr)
+        return 1
+    handler = {
+        'convert': command_convert,
+        'summarize': command_summarize,
+        'index': command_index,
+        'thumbnails': command_thumbnails,
+        'export': command_export,
+    }[args.command]
+    return handler(args, files, level)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import os
+import time
+import json
+import struct
+import logging
+import numpy as np
+from .waveform import Waveform, WFB_MAGIC, WFB_LENGTH
+
+logger = logging.getLogger('CaptureFile')
+
+# Cada entrada do índice guarda o instante da captura e a posição do registro no arquivo de dados
+INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('offset', '<u8')])
+
+
+class CaptureFile:
+    """
+    Arquivo de captura com vários registros de forma de onda, gravados somente por acréscimo.
+
+    Os registros ficam em sequência no arquivo de dados (.wfc), cada um no formato .wfb com o
+    instante da captura no cabeçalho e alinhado em 8 bytes. Um arquivo de índice (.wfc.idx) guarda
+    o instante e a posição de cada registro, permitindo acesso direto por número ou por tempo sem
+    percorrer os dados. A leitura usa numpy.memmap: os pontos de um registro só são lidos do disco
+    quando acessados. Se o índice estiver incompleto (por exemplo, após uma interrupção durante a
+    gravação), ele é reconstruído a partir dos dados e um registro incompleto no final é descartado.
+
+    Os registros devem ser acrescentados em ordem de tempo para a busca por instante funcionar.
+    """
+    def __init__(self, path: str, mode='a'):
+        """
+        Parâmetros:
+            path (str): Caminho do arquivo de dados (.wfc). O índice é gravado em `path` + '.idx'.
+            mode (str, opcional): 'a' para acrescentar registros (cria o arquivo se necessário) ou 'r' para leitura.
+        """
+        if mode not in ('a', 'r'):
+            raise ValueError("Modo inválido. Use 'a' ou 'r'.")
+        self.path = path
+        self.index_path = path + '.idx'
+        self.mode = mode
+        self._data_file = None
+        self._index_file = None
+        self._map = None
+        if mode == 'a':
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            open(path, 'ab').close()
+        elif not os.path.exists(path):
+            raise FileNotFoundError(f"Arquivo de captura não encontrado: {path}")
+        self._index = self._load_index()
+        if mode == 'a':
+            self._data_file = open(path, 'ab')
+            self._index_file = open(self.index_path, 'ab')
+        logger.info(f'Arquivo de captura {path} aberto com {len(self)} registros')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Índice
+    def _load_index(self) -> np.ndarray:
+        """Carrega o índice e completa as entradas que faltam percorrendo o arquivo de dados."""
+        index = np.empty(0, dtype=INDEX_DTYPE)
+        if os.path.exists(self.index_path):
+            entries = os.path.getsize(self.index_path) // INDEX_DTYPE.itemsize
+            index = np.fromfile(self.index_path, dtype=INDEX_DTYPE, count=entries)
+            # Mantém apenas as entradas com posições crescentes (um índice corrompido é refeito)
+            decreasing = np.flatnonzero(np.diff(index['offset'].astype(np.int64)) <= 0)
+            if len(decreasing):
+                index = index[:decreasing[0] + 1]
+        index_size = len(index) * INDEX_DTYPE.itemsize
+
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as file:
+            # Descarta entradas de registros que não chegaram inteiros ao disco
+            offset = 0
+            while len(index):
+                end = self._record_end(file, int(index['offset'][-1]), size)
+                if end is not None:
+                    offset = end
+                    break
+                index = index[:-1]
+            missing = []
+            while (end := self._record_end(file, offset, size)) is not None:
+                missing.append((self._timestamp_at(file, offset), offset))
+                offset = end
+
+        if offset < size:
+            logger.warning(f'Descartando registro incompleto no final de {self.path}')
+        if missing or offset < size or index_size != self._index_size():
+            index = np.concatenate([index, np.array(missing, dtype=INDEX_DTYPE)])
+            if self.mode == 'a':
+                os.truncate(self.path, offset)
+                index.tofile(self.index_path)
+                logger.info(f'Índice de {self.path} reconstruído com {len(index)} registros')
+        return index
+
+    def _index_size(self) -> int:
+        return os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+
+    @staticmethod
+    def _record_end(file, offset: int, size: int) -> int | None:
+        """Retorna a posição seguinte ao registro que começa em `offset`, ou None se ele estiver incompleto."""
+        if offset >= size:
+            return None
+        file.seek(offset)
+        try:
+            header, header_size = Waveform._read_wfb_header(file)
+        except (ValueError, struct.error):
+            return None  # Inclui cabeçalhos truncados (JSONDecodeError é um ValueError)
+        end = offset + header_size + header["points"] * np.dtype(header["dtype"]).itemsize
+        end += -end % 8
+        return end if end <= size else None
+
+    @staticmethod
+    def _timestamp_at(file, offset: int) -> float:
+        file.seek(offset)
+        return Waveform._read_wfb_header(file)[0].get("timestamp", 0.0)
+
+    # Escrita
+    def append(self, waveform: Waveform, timestamp: float | None = None) -> int:
+        """
+        Acrescenta uma waveform ao arquivo e retorna o número do registro.
+
+        Parâmetros:
+            waveform (Waveform): Registro a ser gravado.
+            timestamp (float, opcional): Instante da captura. Padrão: time.time().
+        """
+        if self._data_file is None:
+            raise ValueError("Arquivo de captura aberto somente para leitura")
+        timestamp = time.time() if timestamp is None else timestamp
+        offset = self._data_file.tell()
+        size = waveform._write_wfb(self._data_file, timestamp=timestamp)
+        self._data_file.write(b'\0' * (-size % 8))
+        entry = np.array([(timestamp, offset)], dtype=INDEX_DTYPE)
+        self._index_file.write(entry.tobytes())
+        self._index = np.concatenate([self._index, entry])
+        return len(self._index) - 1
+
+    def flush(self):
+        """Grava no disco os registros acrescentados."""
+        if self._data_file is not None:
+            self._data_file.flush()
+            self._index_file.flush()
+
+    def close(self):
+        """Fecha o arquivo de dados e o índice."""
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+            self._data_file = self._index_file = None
+        self._map = None
+
+    # Leitura
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self):
+        for number in range(len(self)):
+            yield self[number]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Instantes de captura de todos os registros."""
+        return self._index['timestamp']
+
+    def timestamp(self, number: int) -> float:
+        return float(self._index['timestamp'][number])
+
+    def _mapped(self, end: int) -> np.memmap:
+        """Mapeia o arquivo de dados, refazendo o mapa se ele não cobrir até `end`."""
+        if self._map is None or len(self._map) < end:
+            self.flush()
+            self._map = np.memmap(self.path, dtype=np.uint8, mode='r')
+        return self._map
+
+    def _read_header(self, number: int) -> tuple[dict, int]:
+        """Lê o cabeçalho de um registro pelo mapa; retorna o cabeçalho e a posição dos pontos."""
+        offset = int(self._index['offset'][number])
+        prefix_end = offset + len(WFB_MAGIC) + WFB_LENGTH.size
+        (length,) = WFB_LENGTH.unpack(self._mapped(prefix_end)[offset + len(WFB_MAGIC):prefix_end].tobytes())
+        header = json.loads(self._mapped(prefix_end + length)[prefix_end:prefix_end + length].tobytes())
+        return header, prefix_end + length
+
+    def header(self, number: int) -> dict:
+        """Retorna o cabeçalho de um registro (preâmbulo, janela, instante) sem ler seus pontos."""
+        return self._read_header(number)[0]
+
+    def __getitem__(self, number: int) -> Waveform:
+        """Retorna o registro indicado (negativo conta a partir do último) como Waveform mapeada em memória."""
+        header, start = self._read_header(number)
+        end = start + header["points"] * np.dtype(header["dtype"]).itemsize
+        curv = self._mapped(end)[start:end].view(header["dtype"]) if header["points"] else None
+        return Waveform(header["wfmpr"], curv, start=header["start"], stride=header["stride"])
+
+    def find(self, timestamp: float) -> int:
+        """Retorna o número do último registro capturado até `timestamp` (ou 0 se for anterior a todos)."""
+        return max(int(np.searchsorted(self.timestamps, timestamp, side='right')) - 1, 0)
+
+    def between(self, start: float, stop: float) -> range:
+        """Retorna os números dos registros capturados no intervalo [start, stop)."""
+        return range(int(np.searchsorted(self.timestamps, start, side='left')),
+                     int(np.searchsorted(self.timestamps, stop, side='left')))
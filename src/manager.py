@@ -0,0 +1,173 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from serial import SerialException
+from .tektronix import Tektronix, TektronixError
+
+logger = logging.getLogger('TektronixManager')
+
+
+class TektronixManager:
+    """
+    Gerencia vários osciloscópios TDS 340A, com uma conexão aberta por dispositivo.
+
+    As conexões são reaproveitadas entre as operações, verificadas com ID? e reabertas quando a
+    porta falha. As operações são executadas em paralelo (uma thread por dispositivo, uma
+    operação por vez em cada dispositivo) e os resultados são identificados pelo número de série
+    informado pelo device_id(). Números de série repetidos recebem o sufixo '@<porta>'.
+    """
+    def __init__(self, factory=None, max_workers: int | None = None, **tektronix_config):
+        """
+        Parâmetros:
+            factory (callable, opcional): Função que recebe uma porta e retorna um Tektronix conectado.
+                Padrão: Tektronix(port=porta, **tektronix_config).
+            max_workers (int, opcional): Número máximo de dispositivos operados ao mesmo tempo.
+            tektronix_config: Parâmetros repassados ao Tektronix (baudrate, encoding, width, ...).
+        """
+        self._factory = factory or (lambda port: Tektronix(port=port, **tektronix_config))
+        self._serial_config = {key: tektronix_config[key] for key in ('baudrate', 'bytesize', 'stopbits')
+                               if key in tektronix_config}
+        self._devices: dict[str, Tektronix] = {}
+        self._ports: dict[str, str] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getitem__(self, serial_number: str) -> Tektronix:
+        return self._devices[serial_number]
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    @property
+    def serial_numbers(self) -> list[str]:
+        return list(self._devices)
+
+    def discover(self, ports: list[str] | None = None) -> list[str]:
+        """
+        Procura osciloscópios em paralelo e conecta os que ainda não estão no gerenciador.
+
+        As portas já conectadas não são testadas: o ID? do teste poderia consumir a resposta de
+        uma operação em andamento nessa porta.
+
+        Parâmetros:
+            ports (list[str], opcional): Portas a testar. Padrão: todas as portas do sistema.
+
+        Retorna:
+            list: Números de série de todos os dispositivos conectados.
+        """
+        known = set(self._ports.values())
+        ports = [port for port in (Tektronix.get_list_ports() if ports is None else ports) if port not in known]
+        found = Tektronix.probe_ports(ports, **self._serial_config)
+        for port in found:
+            try:
+                self.add(port)
+            except (SerialException, OSError, TektronixError) as e:
+                logger.error(f'Falha ao conectar em {port}: {e}')
+        return self.serial_numbers
+
+    def add(self, port: str) -> str:
+        """Conecta o osciloscópio de uma porta e retorna seu número de série."""
+        tektronix = self._factory(port)
+        info = tektronix.device_id()
+        if not info:
+            tektronix.close_port()
+            raise TektronixError(f"Falha ao identificar o osciloscópio em {port}")
+        serial_number = info["Serial Number"]
+        if serial_number in self._devices and self._ports[serial_number] != port:
+            serial_number = f"{serial_number}@{port}"
+        self._devices[serial_number] = tektronix
+        self._ports[serial_number] = port
+        self._locks.setdefault(serial_number, threading.Lock())
+        logger.info(f'Osciloscópio {serial_number} conectado em {port}')
+        return serial_number
+
+    def reconnect(self, serial_number: str) -> Tektronix:
+        """Fecha e reabre a conexão com um dispositivo."""
+        logger.warning(f'Reconectando {serial_number} em {self._ports[serial_number]}')
+        try:
+            self._devices[serial_number].close_port()
+        except (SerialException, OSError):
+            pass
+        self._devices[serial_number] = self._factory(self._ports[serial_number])
+        return self._devices[serial_number]
+
+    def _healthy(self, tektronix: Tektronix) -> bool:
+        try:
+            return tektronix.device_id() is not None
+        except (SerialException, OSError, TektronixError):
+            return False
+
+    def _run(self, serial_number: str, method: str, args, kwargs):
+        """Executa um método em um dispositivo, reconectando e repetindo uma vez em caso de falha."""
+        with self._locks[serial_number]:
+            tektronix = self._devices[serial_number]
+            if not tektronix.is_open:
+                # Porta fechada, por exemplo após uma reconexão que falhou: tenta reabrir antes
+                tektronix = self.reconnect(serial_number)
+            try:
+                result = getattr(tektronix, method)(*args, **kwargs)
+                if result or self._healthy(tektronix):
+                    return result
+            except (SerialException, OSError) as e:
+                logger.error(f'{serial_number}: falha na porta serial em {method}: {e}')
+            except TektronixError as e:
+                if tektronix.is_open:
+                    raise  # Erro do instrumento (*ESR?), não da conexão
+                logger.error(f'{serial_number}: porta fechada em {method}: {e}')
+            # O Tektronix trata SerialException devolvendo respostas vazias: repete após reconectar
+            tektronix = self.reconnect(serial_number)
+            return getattr(tektronix, method)(*args, **kwargs)
+
+    def run(self, method: str, *args, serial_numbers: list[str] | None = None, **kwargs) -> dict:
+        """
+        Executa um método do Tektronix em paralelo nos dispositivos.
+
+        Parâmetros:
+            method (str): Nome do método do Tektronix (por exemplo, 'ch1_waveform').
+            serial_numbers (list[str], opcional): Dispositivos usados. Padrão: todos.
+
+        Retorna:
+            dict: Número de série -> resultado do método, ou a exceção levantada.
+        """
+        serial_numbers = self.serial_numbers if serial_numbers is None else serial_numbers
+        futures = {
+            serial_number: self._executor.submit(self._run, serial_number, method, args, kwargs)
+            for serial_number in serial_numbers
+        }
+        results = {}
+        for serial_number, future in futures.items():
+            try:
+                results[serial_number] = future.result()
+            except Exception as e:
+                logger.error(f'{serial_number}: {method} falhou: {e}')
+                results[serial_number] = e
+        return results
+
+    def acquire(self, sources=('CH1', 'CH2'), **kwargs) -> dict:
+        """Executa Tektronix.acquire() em todos os dispositivos ao mesmo tempo."""
+        return self.run('acquire', sources, **kwargs)
+
+    def health_check(self) -> dict[str, bool]:
+        """Verifica cada conexão com ID? e reabre as que não responderem."""
+        health = {}
+        for serial_number, healthy in self.run('device_id').items():
+            health[serial_number] = bool(healthy) and not isinstance(healthy, Exception)
+            if not health[serial_number]:
+                try:
+                    self.reconnect(serial_number)
+                    health[serial_number] = self._healthy(self._devices[serial_number])
+                except (SerialException, OSError, TektronixError) as e:
+                    logger.error(f'{serial_number}: falha ao reconectar: {e}')
+        return health
+
+    def close(self):
+        """Fecha todas as conexões e encerra as threads."""
+        for tektronix in self._devices.values():
+            tektronix.close_port()
+        self._executor.shutdown(wait=True)
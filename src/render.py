@@ -0,0 +1,134 @@
+import zlib
+import struct
+import numpy as np
+
+
+class WaveformRenderer:
+    """
+    Renderizador de formas de onda sem interface gráfica, para exportar imagens em massa.
+
+    A imagem é desenhada diretamente em um array NumPy (altura x largura x RGB), reutilizado entre
+    as chamadas: a tela com a grade é criada uma única vez e copiada para o quadro a cada desenho.
+    Os pontos são reduzidos ao mínimo e ao máximo de cada coluna de pixels, então o custo do
+    desenho depende do tamanho da imagem e não do número de pontos, e picos estreitos não somem.
+    As imagens são codificadas em PNG ou BMP sem dependências além do NumPy.
+    """
+    def __init__(self, width=640, height=480, background=(0, 0, 0), trace=(255, 255, 0),
+                 grid=(70, 70, 70), divisions=(10, 8)):
+        """
+        Parâmetros:
+            width, height (int, opcional): Tamanho da imagem, em pixels.
+            background, trace, grid (tuple, opcional): Cores RGB do fundo, da curva e da grade.
+            divisions (tuple, opcional): Divisões horizontais e verticais da grade, como na tela do osciloscópio.
+        """
+        if width < 2 or height < 2:
+            raise ValueError("A imagem deve ter ao menos 2x2 pixels")
+        self.width = width
+        self.height = height
+        self.trace = np.asarray(trace, dtype=np.uint8)
+        self._screen = np.empty((height, width, 3), dtype=np.uint8)
+        self._screen[:] = background
+        for column in np.linspace(0, width - 1, divisions[0] + 1).round().astype(int):
+            self._screen[:, column] = grid
+        for row in np.linspace(0, height - 1, divisions[1] + 1).round().astype(int):
+            self._screen[row, :] = grid
+        self._frame = np.empty_like(self._screen)
+        self._rows = np.arange(height)[:, None]
+
+    def _columns(self, x: np.ndarray, y: np.ndarray, x_range) -> tuple[np.ndarray, np.ndarray]:
+        """Reduz os pontos ao intervalo [mínimo, máximo] de cada coluna, ligando colunas vizinhas."""
+        x_min, x_max = x_range
+        scale = (self.width - 1) / (x_max - x_min) if x_max > x_min else 0.0
+        if len(y) < self.width:
+            # Menos pontos que colunas: interpola um valor por coluna
+            columns = x_min + np.arange(self.width) / scale if scale else np.full(self.width, x_min)
+            values = np.interp(columns, x, y, left=np.nan, right=np.nan)
+            low = high = first = last = values
+        else:
+            column = np.clip(((x - x_min) * scale).astype(np.int64), 0, self.width - 1)
+            starts = np.searchsorted(column, np.arange(self.width))
+            filled = starts < np.append(starts[1:], len(y))  # Colunas com ao menos um ponto
+            starts = starts[filled]
+            low = np.full(self.width, np.nan)
+            high = np.full(self.width, np.nan)
+            first = np.full(self.width, np.nan)
+            last = np.full(self.width, np.nan)
+            low[filled] = np.minimum.reduceat(y, starts)
+            high[filled] = np.maximum.reduceat(y, starts)
+            first[filled] = y[starts]
+            last[filled] = y[np.append(starts[1:], len(y)) - 1]
+        # Estende cada coluna até o último valor da anterior, para a curva não ter falhas
+        previous = np.concatenate(([np.nan], last[:-1]))
+        return np.fmin(low, np.fmin(first, previous)), np.fmax(high, np.fmax(first, previous))
+
+    def render(self, x: np.ndarray, y: np.ndarray, x_range=None, y_range=None) -> np.ndarray:
+        """
+        Desenha a curva y(x) e retorna o quadro (altura x largura x 3, uint8).
+
+        O quadro é reutilizado pela próxima chamada; copie-o se precisar mantê-lo.
+
+        Parâmetros:
+            x, y (np.ndarray): Tempos (em ordem crescente) e valores da curva.
+            x_range, y_range (tuple, opcional): Limites dos eixos. Padrão: os limites dos dados.
+        """
+        np.copyto(self._frame, self._screen)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(y) == 0:
+            return self._frame
+        x_range = x_range or (x[0], x[-1])
+        y_range = y_range or (float(y.min()), float(y.max()))
+        low, high = self._columns(x, y, x_range)
+
+        y_min, y_max = y_range
+        y_scale = (self.height - 1) / (y_max - y_min) if y_max > y_min else 0.0
+        # Linha 0 é o topo da imagem; colunas sem dados ficam com a faixa vazia
+        top = np.clip(np.nan_to_num((y_max - high) * y_scale, nan=self.height), 0, self.height)
+        bottom = np.clip(np.nan_to_num((y_max - low) * y_scale, nan=-1), -1, self.height - 1)
+        mask = (self._rows >= top.round()) & (self._rows <= bottom.round())
+        self._frame[mask] = self.trace
+        return self._frame
+
+    def render_waveform(self, waveform, y_range=None) -> np.ndarray | None:
+        """Desenha uma Waveform com os limites de tensão do preâmbulo (como WaveformPlot); None se não houver dados."""
+        y = waveform.process_curv_data()
+        if y is None:
+            return None
+        if y_range is None:
+            y_range = (waveform.get_voltage_min(), waveform.get_voltage_max())
+        return self.render(waveform.get_time_array(), y, y_range=y_range)
+
+    @staticmethod
+    def encode(image: np.ndarray, file_format='png') -> bytes:
+        """Codifica um quadro RGB em PNG ou BMP."""
+        height, width, _ = image.shape
+        if file_format == 'png':
+            def chunk(kind: bytes, data: bytes) -> bytes:
+                return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+            # Cada linha começa com o filtro 0 (nenhum)
+            rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+            rows[:, 0] = 0
+            rows[:, 1:] = image.reshape(height, -1)
+            return (b'\x89PNG\r\n\x1a\n'
+                    + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+                    + chunk(b'IDAT', zlib.compress(rows.tobytes(), 6))
+                    + chunk(b'IEND', b''))
+        if file_format == 'bmp':
+            # BMP: linhas de baixo para cima, em BGR, completadas até múltiplos de 4 bytes
+            stride = (width * 3 + 3) & ~3
+            rows = np.zeros((height, stride), dtype=np.uint8)
+            rows[:, :width * 3] = image[::-1, :, ::-1].reshape(height, -1)
+            header = struct.pack('<2sIHHI', b'BM', 54 + rows.size, 0, 0, 54)
+            info = struct.pack('<IiiHHIIiiII', 40, width, height, 1, 24, 0, rows.size, 2835, 2835, 0, 0)
+            return header + info + rows.tobytes()
+        raise ValueError("Formato de imagem inválido. Use 'png' ou 'bmp'.")
+
+    def save(self, waveform, path: str) -> bool:
+        """Desenha uma Waveform e salva a imagem; o formato vem da extensão (.png ou .bmp)."""
+        image = self.render_waveform(waveform)
+        if image is None:
+            return False
+        file_format = 'png' if path.lower().endswith('.png') else 'bmp'
+        with open(path, 'wb') as file:
+            file.write(self.encode(image, file_format))
+        return True
@@ -0,0 +1,361 @@
+import time
+import logging
+from collections import deque
+import numpy as np
+
+logger = logging.getLogger('Simulator')
+
+# Formas longas dos mnemônicos aceitas pelo simulador e suas formas curtas
+MNEMONICS = {
+    'DATA': 'DAT', 'SOURCE': 'SOU', 'ENCDG': 'ENC', 'WIDTH': 'WID', 'START': 'STAR',
+    'CURVE': 'CURV', 'WFMPRE': 'WFMPR', 'MEASUREMENT': 'MEASU', 'IMMED': 'IMM', 'TYPE': 'TYP',
+    'VALUE': 'VAL', 'HORIZONTAL': 'HOR', 'MAIN': 'MAI', 'SCALE': 'SCA', 'TRIGGER': 'TRIG',
+    'POSITION': 'POS', 'ACQUIRE': 'ACQ', 'MODE': 'MOD', 'COUPLING': 'COUP', 'DEFINE': 'DEF',
+    'DELAY': 'DEL', 'DELAYED': 'DEL', 'NUMACQ': 'NUMAC', 'ASCII': 'ASCI', 'RIBINARY': 'RIB', 'RPBINARY': 'RPB', 'FREQUENCY': 'FREQ',
+}
+
+
+class SimulatedTDS340A:
+    """
+    Osciloscópio TDS 340A simulado, com a mesma interface de um serial.Serial.
+
+    Pode ser passado como `transport` para o Tektronix, permitindo usar e medir o driver sem o
+    instrumento. Responde a ID?, *ESR?, ALLE?, *OPC?, DAT, WFMPR?, CURV?, MEASU:IMM, ACQ:STATE,
+    ACQ:NUMAC?, RS232:BAUD e às consultas de escala, com cargas realistas. O tempo de transmissão de
+    cada byte no baudrate configurado é simulado, assim como um atraso de processamento por mensagem.
+    Cada comando de uma mensagem com ';' é interpretado a partir da raiz da árvore de comandos.
+    """
+    RECORD_LENGTH = 1000
+
+    def __init__(self, baudrate=19200, bytesize=8, stopbits=1, timeout=1, latency=0.005, realtime=True,
+                 serial_number='CF:91.1CT', frequency=1e3, noise=0.02, seed=None):
+        """
+        Parâmetros:
+            baudrate (int, opcional): Baudrate inicial da porta e do instrumento.
+            timeout (float, opcional): Tempo máximo de espera das leituras, como no serial.Serial.
+            latency (float, opcional): Atraso de processamento, em segundos, antes de cada resposta.
+            realtime (bool, opcional): Se False, as respostas ficam disponíveis imediatamente.
+            serial_number (str, opcional): Segundo campo da resposta do ID?.
+            frequency (float, opcional): Frequência, em Hz, dos sinais de CH1 e CH2.
+            noise (float, opcional): Desvio padrão do ruído, em volts.
+            seed (int, opcional): Semente do gerador de ruído.
+        """
+        self.port = 'sim://tds340a'
+        self.baudrate = baudrate
+        self.bytesize = bytesize
+        self.stopbits = stopbits
+        self.timeout = timeout
+        self.latency = latency
+        self.realtime = realtime
+        self.serial_number = serial_number
+        self.frequency = frequency
+        self.noise = noise
+        self.is_open = True
+        self.instrument_baudrate = baudrate
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self._rng = np.random.default_rng(seed)
+        self._rx = bytearray()
+        self._pending = deque()  # [dados, instante do primeiro byte]
+        self._busy_until = 0.0
+        self.reset()
+
+    # Interface de serial.Serial
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    def isOpen(self):
+        return self.is_open
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+        self._pending.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    @property
+    def in_waiting(self) -> int:
+        self._receive(time.perf_counter())
+        return len(self._rx)
+
+    def write(self, data: bytes) -> int:
+        if not self.is_open:
+            raise OSError("Porta simulada fechada")
+        self.bytes_written += len(data)
+        now = time.perf_counter()
+        # O instrumento só recebe a mensagem depois de todos os bytes serem transmitidos
+        received_at = now + len(data) * self._byte_time()
+        if self.baudrate != self.instrument_baudrate:
+            logger.debug('Baudrate diferente do instrumento: mensagem ignorada')
+            return len(data)
+        for message in bytes(data).split(b'\n'):
+            if message.strip():
+                response = self._execute(message.decode(errors='replace').strip())
+                if response:
+                    start = max(received_at + self.latency, self._busy_until) if self.realtime else now
+                    self._pending.append([response, start])
+                    self._busy_until = start + len(response) * self._byte_time()
+        return len(data)
+
+    def read(self, size=1) -> bytes:
+        deadline = self._deadline()
+        while True:
+            now = time.perf_counter()
+            self._receive(now)
+            if len(self._rx) >= size or not self._pending or (deadline is not None and now >= deadline):
+                break
+            self._wait((size - len(self._rx)) * self._byte_time(), deadline)
+        return self._take(min(size, len(self._rx)))
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read_until(self, expected=b'\n', size=None) -> bytes:
+        deadline = self._deadline()
+        while True:
+            now = time.perf_counter()
+            self._receive(now)
+            index = self._rx.find(expected)
+            if index >= 0 and (size is None or index + len(expected) <= size):
+                return self._take(index + len(expected))
+            if size is not None and len(self._rx) >= size:
+                return self._take(size)
+            if not self._pending or (deadline is not None and now >= deadline):
+                return self._take(len(self._rx))
+            self._wait(16 * self._byte_time(), deadline)
+
+    def readline(self) -> bytes:
+        return self.read_until(b'\n')
+
+    # Temporização do link
+    def _byte_time(self) -> float:
+        """Tempo de transmissão de um byte (bit de início + dados + parada)."""
+        if not self.realtime:
+            return 0.0
+        return (1 + self.bytesize + self.stopbits) / self.baudrate
+
+    def _deadline(self) -> float | None:
+        return None if self.timeout is None else time.perf_counter() + self.timeout
+
+    def _wait(self, duration: float, deadline: float | None):
+        if self._pending:
+            duration = max(duration, self._pending[0][1] - time.perf_counter())
+        if deadline is not None:
+            duration = min(duration, deadline - time.perf_counter())
+        time.sleep(max(duration, 0.0002))
+
+    def _receive(self, now: float):
+        """Move para o buffer de leitura os bytes que já chegaram na porta."""
+        byte_time = self._byte_time()
+        while self._pending:
+            segment = self._pending[0]
+            data, start = segment
+            if now < start:
+                break
+            count = len(data) if byte_time == 0 else min(len(data), int((now - start) / byte_time) + 1)
+            self._rx += data[:count]
+            if count < len(data):
+                segment[0] = data[count:]
+                segment[1] = start + count * byte_time
+                break
+            self._pending.popleft()
+
+    def _take(self, size: int) -> bytes:
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        self.bytes_read += len(data)
+        return data
+
+    # Instrumento
+    def reset(self):
+        """Restaura as configurações de fábrica (*RST)."""
+        self.esr = 0
+        self.events = deque()
+        self.settings = {
+            'DAT:SOU': 'CH1', 'DAT:ENC': 'RIB', 'DAT:WID': '1', 'DAT:STAR': '1', 'DAT:STOP': str(self.RECORD_LENGTH),
+            'MEASU:IMM:SOU': 'CH1', 'MEASU:IMM:TYP': 'FREQ',
+            'HOR:MOD': 'MAI', 'HOR:MAI:SCA': '5.0E-4', 'HOR:DEL:SCA': '5.0E-5', 'HOR:POS': '5.0E1',
+            'HOR:TRIG:POS': '50', 'ACQ:MOD': 'SAMPLE', 'ACQ:STATE': '1',
+            'CH1:SCA': '1.0E0', 'CH1:POS': '0.0E0', 'CH1:COUP': 'DC',
+            'CH2:SCA': '1.0E0', 'CH2:POS': '0.0E0', 'CH2:COUP': 'DC',
+            'MATH:DEF': '"CH1+CH2"', 'RS232:BAUD': str(self.instrument_baudrate),
+        }
+        self._frozen = None
+        self._stopped_count = 0
+        self._run_since = time.perf_counter()
+
+    @staticmethod
+    def _normalize(header: str) -> str:
+        return ':'.join(MNEMONICS.get(part, part) for part in header.upper().lstrip(':').split(':'))
+
+    def _error(self, code: int, message: str):
+        self.esr |= 32  # Bit de erro de comando
+        self.events.append(f'{code},"{message}"')
+
+    def _execute(self, message: str) -> bytes:
+        """Executa uma mensagem (comandos separados por ';') e retorna a resposta completa."""
+        responses = []
+        for command in message.split(';'):
+            header, _, value = command.strip().partition(' ')
+            if not header:
+                continue
+            header = self._normalize(header)
+            if header.endswith('?'):
+                response = self._query(header[:-1])
+                if response is not None:
+                    responses.append(response)
+            else:
+                self._set(header, MNEMONICS.get(value.strip().upper(), value.strip()))
+        if not responses:
+            return b''
+        return b';'.join(r if isinstance(r, bytes) else r.encode() for r in responses) + b'\n'
+
+    def _set(self, header: str, value: str):
+        if header == '*RST':
+            self.reset()
+        elif header == '*CLS':
+            self.esr = 0
+            self.events.clear()
+        elif header == 'RS232:BAUD':
+            self.settings[header] = value
+            self.instrument_baudrate = int(value)
+        elif header == 'ACQ:STATE':
+            running = value.upper() in ('1', 'ON', 'RUN')
+            self.settings[header] = '1' if running else '0'
+            if running:
+                self._frozen = None
+                self._run_since = time.perf_counter()  # ACQ:NUMAC? conta a partir do RUN
+            elif self._frozen is None:
+                self._stopped_count = self._acquisitions()
+                self._frozen = self._acquire_all()
+        elif header in self.settings:
+            self.settings[header] = value
+        else:
+            self._error(113, f'Undefined header; Command not found: {header}')
+
+    def _query(self, header: str):
+        if header == 'ID':
+            return f'TEK/TDS 340A,{self.serial_number},FV:v1.00'
+        if header == '*ESR':
+            esr, self.esr = self.esr, 0
+            return str(esr)
+        if header == 'ALLE':
+            events = ','.join(self.events) or '0,"No events to report - queue empty"'
+            self.events.clear()
+            return events
+        if header == '*OPC':
+            return '1'
+        if header == 'WFMPR':
+            return self._preamble()
+        if header == 'CURV':
+            return self._curve()
+        if header == 'MEASU:IMM:VAL':
+            return self._measurement()
+        if header == 'ACQ:NUMAC':
+            return str(self._acquisitions())
+        if header in self.settings:
+            return self.settings[header]
+        self._error(113, f'Undefined header; Command not found: {header}')
+        return None
+
+    # Sinais simulados
+    def _window(self) -> tuple[int, int]:
+        start = min(max(int(self.settings['DAT:STAR']), 1), self.RECORD_LENGTH)
+        stop = min(max(int(self.settings['DAT:STOP']), start), self.RECORD_LENGTH)
+        return start, stop
+
+    def _x_increment(self) -> float:
+        scale = self.settings['HOR:DEL:SCA' if self.settings['HOR:MOD'] == 'DEL' else 'HOR:MAI:SCA']
+        return float(scale) * 10 / self.RECORD_LENGTH
+
+    def _volts_per_level(self, source: str) -> float:
+        """Tensão de um nível do conversor de 8 bits (25 níveis por divisão)."""
+        channel = source if source in ('CH1', 'CH2') else 'CH1'
+        return float(self.settings[f'{channel}:SCA']) / 25
+
+    def _signal(self, source: str) -> np.ndarray:
+        t = np.arange(self.RECORD_LENGTH) * self._x_increment()
+        phase = 2 * np.pi * self.frequency * t
+        if source in ('CH1', 'REF1'):
+            volts = 2.0 * np.sin(phase)
+        elif source in ('CH2', 'REF2'):
+            volts = 1.0 * np.sign(np.sin(phase))
+        else:
+            volts = 2.0 * np.sin(phase) + np.sign(np.sin(phase))
+        if source in ('CH1', 'CH2', 'MATH'):
+            volts = volts + self._rng.normal(0, self.noise, volts.shape)
+        return volts
+
+    def _acquisitions(self) -> int:
+        """Registros adquiridos desde o último RUN; um registro leva 10 divisões da base de tempo."""
+        if self._frozen is not None:
+            return self._stopped_count
+        return int((time.perf_counter() - self._run_since) / (float(self.settings['HOR:MAI:SCA']) * 10))
+
+    def _acquire_all(self) -> dict[str, np.ndarray]:
+        return {source: self._signal(source) for source in ('CH1', 'CH2', 'MATH', 'REF1', 'REF2')}
+
+    def _levels(self, source: str) -> np.ndarray:
+        """Níveis de 8 bits do registro completo da fonte."""
+        volts = self._frozen[source] if self._frozen else self._signal(source)
+        position = float(self.settings.get(f'{source}:POS', 0.0))
+        levels = np.round(volts / self._volts_per_level(source) + position * 25)
+        return np.clip(levels, -128, 127).astype(np.int16)
+
+    def _preamble(self) -> str:
+        source = self.settings['DAT:SOU']
+        width = int(self.settings['DAT:WID'])
+        encoding = self.settings['DAT:ENC']
+        start, stop = self._window()
+        y_increment = self._volts_per_level(source) / (256 if width == 2 else 1)
+        # O campo de YZERO (em mV) compensa o deslocamento dos dados sem sinal (RPB)
+        offset = (32768 if width == 2 else 128) if encoding == 'RPB' else 0
+        scale = float(self.settings.get(f'{source}:SCA', self.settings['CH1:SCA']))
+        info = (f'"{source.capitalize()}, {self.settings.get(f"{source}:COUP", "DC")} coupling, '
+                f'{scale:.1E} V/div, {float(self.settings["HOR:MAI:SCA"]):.1E} s/div, '
+                f'{self.RECORD_LENGTH} points, Sample mode"')
+        fields = [
+            str(width), str(width * 8), 'ASC' if encoding == 'ASCI' else 'BIN',
+            'RP' if encoding == 'RPB' else 'RI', 'MSB', info, str(stop - start + 1), 'Y', '"s"',
+            f'{self._x_increment():.4E}', str(int(self.settings['HOR:TRIG:POS']) * 10 - start + 1),
+            '"V"', f'{y_increment:.4E}', f'{-offset * y_increment * 1e3:.4E}', '0.0E0'
+        ]
+        return ';'.join(fields)
+
+    def _curve(self):
+        source = self.settings['DAT:SOU']
+        width = int(self.settings['DAT:WID'])
+        encoding = self.settings['DAT:ENC']
+        start, stop = self._window()
+        levels = self._levels(source)[start - 1:stop].astype(np.int32)
+        if width == 2:
+            levels = levels * 256
+        if encoding == 'RPB':
+            levels = levels + (32768 if width == 2 else 128)
+        if encoding == 'ASCI':
+            return ','.join(map(str, levels.tolist()))
+        dtype = f">{'u' if encoding == 'RPB' else 'i'}{width}"
+        data = levels.astype(dtype).tobytes()
+        length = str(len(data))
+        return f'#{len(length)}{length}'.encode() + data
+
+    def _measurement(self) -> str:
+        if self.settings['MEASU:IMM:TYP'] != 'FREQ':
+            self._error(221, f"Settings conflict; Measurement {self.settings['MEASU:IMM:TYP']} not simulated")
+            return '9.9E37'
+        return f'{self.frequency:.4E}'
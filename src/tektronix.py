@@ -1,58 +1,310 @@
+import os
+import json
 import time
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from serial import Serial, EIGHTBITS, STOPBITS_ONE, PARITY_NONE, SerialException
-from serial.tools import list_ports
 from .waveform import Waveform, WaveformPlot
+from .util import RingBuffer, LinkMetrics
 
-# Configuração do logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('tektronix.log'),   # Log para arquivo
-        logging.StreamHandler()                 # Log para o console
-    ]
-)
+# O logging é configurado pela aplicação (veja util.configure_logging), não na importação
 logger = logging.getLogger('Tektronix')
 
+# Última porta e baudrate em que o osciloscópio foi encontrado, testados primeiro na próxima busca
+DEVICE_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'tektronix340a', 'device.json')
+
 class Tektronix():
-    def __init__(self, baudrate=19200, bytesize=EIGHTBITS, stopbits=STOPBITS_ONE):
-        self.__ser = Serial(baudrate=baudrate, bytesize=bytesize, stopbits=stopbits, timeout=1)
-        self.__find_device()
+    # Codificações aceitas pelo comando DAT:ENC (ASCII, binário com sinal e binário sem sinal)
+    ENCODINGS = ('ASCI', 'RIB', 'RPB')
+
+    # Consultas curtas às escalas de cada fonte; se a resposta não mudar, o preâmbulo em cache
+    # continua válido. A base de tempo atrasada (HOR:MOD, HOR:DEL:SCA) e a posição horizontal
+    # mudam o XINCR e o deslocamento dos pontos. As referências não têm consulta e sempre
+    # repetem o WFMPR?.
+    HORIZONTAL_CHECK = 'HOR:MOD?;:HOR:MAI:SCA?;:HOR:DEL:SCA?;:HOR:POS?;:HOR:TRIG:POS?;:ACQ:MOD?'
+    PREAMBLE_CHECKS = {
+        'CH1': HORIZONTAL_CHECK + ';:CH1:SCA?;:CH1:POS?;:CH1:COUP?',
+        'CH2': HORIZONTAL_CHECK + ';:CH2:SCA?;:CH2:POS?;:CH2:COUP?',
+        'MATH': HORIZONTAL_CHECK + ';:MATH:DEF?;:CH1:SCA?;:CH1:POS?;:CH2:SCA?;:CH2:POS?',
+    }
+
+    # Número de pontos do registro de aquisição do TDS 340A
+    RECORD_LENGTH = 1000
+    CHUNK_SIZE = 512  # Máximo de bytes lidos por vez ao receber CURV?
+
+    # Fontes de forma de onda aceitas por DAT:SOU
+    SOURCES = ('CH1', 'CH2', 'MATH', 'REF1', 'REF2')
+
+    # Configurações que também mudam pelo painel frontal e por isso nunca entram no cache
+    VOLATILE_SETTINGS = ('ACQ:STATE',)
+
+    def __init__(self, baudrate=19200, bytesize=EIGHTBITS, stopbits=STOPBITS_ONE, encoding='RIB', width=2,
+                 start=1, stop=RECORD_LENGTH, stride=1, transport=None, port: str | None = None):
+        """
+        Parâmetros:
+            port (str, opcional): Porta serial do osciloscópio. Se não for informada, o dispositivo
+                é procurado em todas as portas.
+            transport (opcional): Objeto com a interface de serial.Serial (por exemplo, um
+                SimulatedTDS340A) usado no lugar da porta serial. Quando fornecido, a busca pelo
+                dispositivo e os parâmetros baudrate, bytesize e stopbits são ignorados.
+        """
+        self.metrics = LinkMetrics()
+        self.log_payload = 64  # Caracteres das respostas incluídos no log de DEBUG (0 desativa)
+        self.curve_progress = None  # Função chamada com (bytes recebidos, total ou None) durante o CURV?
+        self.__curve_bytes = 0
+        self.__settings: dict[str, str] = {}  # Cópia das configurações já escritas no instrumento
+        self.__preambles: dict[tuple, tuple[str, str]] = {}  # Chave -> (resposta das escalas, WFMPR?)
+        self.__injected = transport is not None  # Transporte fornecido: não é uma porta do sistema
+        if transport is not None:
+            self.__ser = transport
+            if not self.__ser.is_open:
+                self.__ser.open()
+        elif port is not None:
+            self.__ser = Serial(port, baudrate=baudrate, bytesize=bytesize, stopbits=stopbits, timeout=1)
+            if not self.__verify_link():
+                self.__ser.close()
+                raise TektronixError(f"Nenhum ociloscópio Tektronix respondeu em {port}")
+        else:
+            self.__ser = Serial(baudrate=baudrate, bytesize=bytesize, stopbits=stopbits, timeout=1)
+            self.__find_device()
+
+        self.encoding = encoding
+        self.width = width
+        self.set_window(start, stop, stride)
 
         self.device_info = None
+        self.throughput: dict[int, float] = {}  # Vazão medida por negotiate_baudrate()
         logger.info('Objeto Tektronix inicializado')
 
     def __find_device(self):
-        for port in list_ports.comports():
+        """
+        Procura o osciloscópio, testando primeiro a porta e o baudrate salvos da última conexão
+        e, se não responderem, todas as portas seriais em paralelo.
+        """
+        baudrate = self.__ser.baudrate  # Baudrate pedido; o do cache só vale para a porta em cache
+        cached = self.load_device_cache()
+        if cached:
             try:
-                self.__ser.port = port.device
+                self.__ser.port = cached["port"]
+                self.__ser.baudrate = cached["baudrate"]
                 self.__ser.open()
-                self.__ser.write(b"ID?\n")
-                response = self.__ser.readline().decode().strip()
-                print(response)
-                if "TEK/TDS 340A" in response.upper():
-                    print(f"Osciloscópio encontrado em {port.device}: {response}")
+                if self.__verify_link():
+                    logger.info(f"Osciloscópio encontrado em {cached['port']} (cache)")
                     return
                 self.__ser.close()
-            except Exception as e:
-                print(f"Erro ao acessar {port.device}: {e}")
+            except (SerialException, OSError, KeyError, ValueError) as e:
+                logger.debug(f"Porta em cache indisponível: {e}")
+                if self.__ser.isOpen():
+                    self.__ser.close()
+
+        self.__ser.baudrate = baudrate
+        devices = self.probe_ports(baudrate=self.__ser.baudrate, bytesize=self.__ser.bytesize,
+                                   stopbits=self.__ser.stopbits, first_only=True)
+        for port, response in devices.items():
+            self.__ser.port = port
+            self.__ser.open()
+            logger.info(f"Osciloscópio encontrado em {port}: {response}")
+            self.save_device_cache()
+            return
         raise Exception("Nenhum ociloscópio Tektronix foi encontrado")
-    
+
+    @staticmethod
+    def probe_port(port: str, baudrate=19200, bytesize=EIGHTBITS, stopbits=STOPBITS_ONE, timeout=None) -> str | None:
+        """
+        Envia ID? para uma porta e retorna a resposta se ela vier de um TDS 340A.
+
+        O tempo de espera padrão é curto (o suficiente para a resposta do ID? no baudrate
+        informado), para que portas sem o instrumento sejam descartadas rapidamente.
+        """
+        if timeout is None:
+            timeout = 0.2 + 640 / baudrate  # ~64 caracteres de 10 bits
+        try:
+            with Serial(port, baudrate=baudrate, bytesize=bytesize, stopbits=stopbits, timeout=timeout) as ser:
+                ser.write(b"ID?\n")
+                response = ser.readline().decode(errors='replace').strip()
+        except (SerialException, OSError) as e:
+            logger.debug(f"Erro ao acessar {port}: {e}")
+            return None
+        return response if Tektronix.is_device_id(response) else None
+
+    @staticmethod
+    def probe_ports(ports: list[str] | None = None, first_only=False, **serial_config) -> dict[str, str]:
+        """
+        Testa várias portas seriais em paralelo com probe_port().
+
+        Parâmetros:
+            ports (list[str], opcional): Portas a testar. Padrão: todas as portas do sistema.
+            first_only (bool, opcional): Retorna assim que o primeiro osciloscópio responder.
+            serial_config: Parâmetros repassados a probe_port() (baudrate, bytesize, stopbits, timeout).
+
+        Retorna:
+            dict: Porta -> resposta do ID? de cada osciloscópio encontrado.
+        """
+        if ports is None:
+            ports = Tektronix.get_list_ports()
+        if not ports:
+            return {}
+
+        devices = {}
+        executor = ThreadPoolExecutor(max_workers=len(ports))
+        try:
+            futures = {executor.submit(Tektronix.probe_port, port, **serial_config): port for port in ports}
+            for future in as_completed(futures):
+                response = future.result()
+                if response:
+                    devices[futures[future]] = response
+                    if first_only:
+                        break
+        finally:
+            # Com first_only, as portas restantes terminam o teste em segundo plano
+            executor.shutdown(wait=not first_only, cancel_futures=True)
+        return devices
+
+    @staticmethod
+    def load_device_cache() -> dict | None:
+        """Lê a última porta e baudrate salvos, ou None se não houver cache válido."""
+        try:
+            with open(DEVICE_CACHE, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def save_device_cache(self):
+        """Salva a porta e o baudrate atuais para acelerar a próxima busca."""
+        if self.__injected:
+            return  # A porta de um transporte fornecido (por exemplo, o simulador) não serve à busca
+        try:
+            os.makedirs(os.path.dirname(DEVICE_CACHE), exist_ok=True)
+            with open(DEVICE_CACHE, 'w') as file:
+                json.dump({"port": self.__ser.port, "baudrate": self.__ser.baudrate}, file)
+        except OSError as e:
+            logger.warning(f"Falha ao salvar o cache do dispositivo: {e}")
+
     def __re_open_port(self):
         if self.__ser.isOpen():
             self.__ser.close()
         self.__ser.open()
+        self.reset_settings_cache()
+        self.reset_preamble_cache()
+
+    def reset_settings_cache(self):
+        """Descarta a cópia local das configurações do instrumento, forçando o reenvio de todas."""
+        self.__settings.clear()
+        logger.debug('Cache de configurações descartado')
+
+    @staticmethod
+    def is_device_id(response: str) -> bool:
+        """Indica se a resposta do ID? é de um TDS 340A."""
+        return "TEK/TDS 340A" in response.upper()
+
+    def __verify_link(self) -> bool:
+        """Confirma com um ID? que o instrumento responde na configuração atual da porta."""
+        try:
+            self.__ser.reset_input_buffer()
+            self.__ser.write(b"ID?\n")
+            return self.is_device_id(self.__ser.readline().decode(errors='replace'))
+        except SerialException as e:
+            logger.error(f'Falha ao verificar o link serial: {e}')
+            return False
+
+    def __switch_baudrate(self, current: int, new_baudrate: int):
+        """Envia RS232:BAUD na taxa atual e muda a porta local para a nova taxa."""
+        self.__ser.baudrate = current
+        self.__ser.write(f":RS232:BAUD {new_baudrate}\n".encode())
+        self.__ser.flush()
+        time.sleep(0.1)  # Aguarda o instrumento reconfigurar a interface
+        self.__ser.baudrate = new_baudrate
+
+    def set_baudrate(self, new_baudrate: int) -> bool:
+        """
+        Muda a taxa do instrumento (RS232:BAUD) e da porta local, confirmando o link com ID?.
+
+        Se o instrumento não responder na nova taxa, a taxa anterior é restaurada nos dois lados.
+
+        Retorna:
+            bool: True se o link funciona na nova taxa, False se a taxa anterior foi restaurada.
+        """
+        old_baudrate = self.__ser.baudrate
+        if new_baudrate == old_baudrate:
+            return True
+
+        logger.info(f'Alterando baudrate de {old_baudrate} para {new_baudrate}')
+        self.__switch_baudrate(old_baudrate, new_baudrate)
+        self.reset_settings_cache()
+        if self.__verify_link():
+            self.save_device_cache()
+            return True
+
+        # O instrumento pode não ter aceitado a nova taxa: tenta a taxa anterior na porta local
+        logger.warning(f'Sem resposta em {new_baudrate} baud, restaurando {old_baudrate}')
+        self.__ser.baudrate = old_baudrate
+        if self.__verify_link():
+            return False
+
+        # O instrumento mudou de taxa, mas o link não é estável: pede para voltar à taxa anterior
+        self.__switch_baudrate(new_baudrate, old_baudrate)
+        if self.__verify_link():
+            return False
+        raise TektronixError(f"Link perdido ao alterar o baudrate para {new_baudrate}")
+
+    def measure_throughput(self, repeat=3, source='CH1') -> float:
+        """
+        Mede a vazão do link, em bytes por segundo, transferindo a curva de uma fonte.
+
+        A configuração DAT (codificação, largura e janela) vai no mesmo lote do CURV?, então a
+        medida não depende do estado em que o instrumento foi deixado. Os bytes contados são os
+        recebidos pela porta (LinkMetrics.bytes_in), não o número de pontos.
+        """
+        received = self.metrics.bytes_in
+        start = time.perf_counter()
+        for _ in range(repeat):
+            res = self.commands(self.__data_setup(source) + ["CURV?"])
+            if not res:
+                raise TektronixError("Falha ao medir a vazão do link")
+        return (self.metrics.bytes_in - received) / (time.perf_counter() - start)
+
+    def negotiate_baudrate(self, baudrates: list[int] | None = None) -> int:
+        """
+        Procura a taxa de comunicação com maior vazão entre as suportadas.
+
+        Cada taxa é configurada no instrumento e na porta local, verificada com ID? e avaliada
+        com measure_throughput(). A taxa com maior vazão medida é mantida ao final, e as medidas
+        ficam em `self.throughput` (baudrate -> bytes/s).
+
+        Retorna:
+            int: A taxa escolhida.
+        """
+        original = self.__ser.baudrate
+        self.throughput = {}
+        for baudrate in sorted(baudrates or self.get_baudrate_list(), reverse=True):
+            try:
+                if not self.set_baudrate(baudrate):
+                    continue
+                self.throughput[baudrate] = self.measure_throughput()
+                logger.info(f'{baudrate} baud: {self.throughput[baudrate]:.0f} bytes/s')
+            except TektronixError as e:
+                logger.warning(f'Taxa {baudrate} descartada: {e}')
+                self.discard_input()
+
+        if not self.throughput:
+            self.set_baudrate(original)
+            raise TektronixError("Nenhuma taxa de comunicação estável foi encontrada")
+
+        best = max(self.throughput, key=self.throughput.get)
+        if not self.set_baudrate(best):
+            raise TektronixError(f"Falha ao restaurar a taxa escolhida ({best} baud)")
+        logger.info(f'Baudrate negociado: {best}')
+        return best
 
-    #TODO: sincronizar as propriedades do objeto com as configurações do dispositivo antes de aplicar
     @property
     def baudrate(self):
         return self.__ser.baudrate
     
     @baudrate.setter
     def baudrate(self, new_baudrate):
-        self.__ser.baudrate = new_baudrate
-        self.__re_open_port()
+        if not self.set_baudrate(new_baudrate):
+            raise TektronixError(f"O instrumento não respondeu em {new_baudrate} baud")
 
     @property
     def bytesize(self):
@@ -72,6 +324,64 @@ class Tektronix():
         self.__ser.stopbits = new_stopbits
         self.__re_open_port()
 
+    @property
+    def encoding(self):
+        return self.__encoding
+
+    @encoding.setter
+    def encoding(self, new_encoding):
+        if new_encoding not in self.ENCODINGS:
+            raise ValueError(f"Codificação inválida: {new_encoding}. Use {', '.join(self.ENCODINGS)}")
+        self.__encoding = new_encoding
+
+    @property
+    def width(self):
+        return self.__width
+
+    @width.setter
+    def width(self, new_width):
+        if new_width not in (1, 2):
+            raise ValueError("A largura dos dados deve ser 1 ou 2 bytes")
+        self.__width = new_width
+
+    @property
+    def start(self):
+        return self.__start
+
+    @property
+    def stop(self):
+        return self.__stop
+
+    @property
+    def stride(self):
+        return self.__stride
+
+    def set_window(self, start=1, stop=RECORD_LENGTH, stride=1):
+        """
+        Define a janela do registro transferida pelo CURV? e a decimação aplicada aos pontos.
+
+        Parâmetros:
+            start (int, opcional): Primeiro ponto do registro enviado pelo instrumento (DAT:STAR).
+            stop (int, opcional): Último ponto do registro enviado pelo instrumento (DAT:STOP).
+            stride (int, opcional): Mantém um ponto a cada `stride`. O TDS 340A não decima no
+                instrumento, então a decimação é feita na Waveform, após a transferência.
+        """
+        self._check_window(start, stop, stride)
+        self.__start = start
+        self.__stop = stop
+        self.__stride = stride
+
+    @classmethod
+    def _check_window(cls, start: int, stop: int, stride: int):
+        if not 1 <= start <= stop <= cls.RECORD_LENGTH:
+            raise ValueError(f"Janela inválida: a condição 1 <= start <= stop <= {cls.RECORD_LENGTH} deve ser satisfeita")
+        if stride < 1:
+            raise ValueError("O passo de decimação deve ser maior que zero")
+
+    @property
+    def binary(self) -> bool:
+        return self.__encoding != 'ASCI'
+
     #TODO: verificar a necessidade desses métodos
     @staticmethod
     def get_baudrate_list()->list[int]:
@@ -81,66 +391,320 @@ class Tektronix():
     @staticmethod
     def get_list_ports()->list[str]:
         logger.debug('Lista de portas seriais solicitada')
+        from serial.tools import list_ports  # Carregado somente ao procurar portas
         return [port.device for port in list_ports.comports()]
 
+    @property
+    def port(self):
+        return self.__ser.port
+
+    @property
+    def is_open(self) -> bool:
+        return self.__ser.is_open
+
     def close_port(self):
         if self.__ser.isOpen():
             self.__ser.close()
             logger.info('Porta serial fechada')
 
+    @staticmethod
+    def is_query(command: str) -> bool:
+        """Indica se o comando é uma consulta, isto é, se o instrumento envia uma resposta."""
+        return command.strip().endswith('?')
+
+    @staticmethod
+    def join_commands(commands: list[str]) -> bytes:
+        """
+        Concatena comandos em uma única mensagem separada por ';'.
+
+        Cada cabeçalho recebe ':' no início para ser interpretado a partir da raiz da árvore de
+        comandos, e não relativo ao cabeçalho do comando anterior da mesma mensagem.
+        """
+        headers = [cmd.strip() if cmd.strip().startswith((':', '*')) else ':' + cmd.strip() for cmd in commands]
+        return ';'.join(headers).encode() + b'\n'
+
+    @staticmethod
+    def _setting(command: str) -> tuple[str, str] | None:
+        """Separa um comando de configuração em (cabeçalho, valor), ou None se não tiver valor."""
+        header, _, value = command.strip().lstrip(':').partition(' ')
+        if not value or header.startswith('*') or header.upper() in Tektronix.VOLATILE_SETTINGS:
+            return None
+        return header.upper(), value.strip()
+
     def command(self, command:str) -> str:
-        if not isinstance(command, str):
-            raise TypeError("The command must be a str")
+        res = self.commands([command])
+        return res[0] if res else ''
+
+    def commands(self, commands:list[str]) -> list[str]:
+        """
+        Envia uma sequência de comandos com o mínimo de trocas pela porta serial.
+
+        Comandos de configuração consecutivos são agrupados com a consulta seguinte em uma única
+        escrita e só se espera resposta das consultas. O *ESR? é verificado uma única vez, ao
+        final do lote, junto com os comandos de configuração restantes.
+
+        Comandos de configuração cujo valor já foi escrito no instrumento (segundo o cache de
+        configurações) não são reenviados.
+
+        Retorna:
+            list: As respostas não vazias das consultas, na ordem em que foram enviadas.
+        """
+        for cmd in commands:
+            if not isinstance(cmd, str):
+                raise TypeError("The command must be a str")
 
         if not self.__ser.is_open:
             raise TektronixError("Porta não disponível")
 
+        out_list = []
+        pending = []
+        written = {}
         try:
-            self.__ser.write(command.encode() + b'\n')
-            response = self.read_response().strip()
+            for cmd in commands:
+                if cmd.strip().upper().lstrip(':').startswith('*RST'):
+                    self.reset_settings_cache()
+                    written.clear()  # As configurações anteriores do lote também voltam ao padrão
+                setting = self._setting(cmd)
+                if setting:
+                    header, value = setting
+                    if written.get(header, self.__settings.get(header)) == value:
+                        continue
+                    written[header] = value
+                pending.append(cmd)
+                if not self.is_query(cmd):
+                    continue
+                if cmd.strip().upper().lstrip(':') in ('CURV?', 'CURVE?'):
+                    out = self.__exchange(self.join_commands(pending), self.read_curve)
+                else:
+                    out = self.__exchange(self.join_commands(pending), self.read_response).strip()
+                pending = []
+                if len(out):
+                    out_list.append(out)
 
-            self.__ser.write(b"*ESR?\n")
-            error = self.__ser.readline().decode().strip()
+            error = self.__exchange(self.join_commands(pending + ["*ESR?"]), self.read_response).strip()
             if error and error != "0":
-                self.__ser.write(b"ALLE?")
-                error_details = self.__ser.readline().decode().strip()
-                raise TektronixError(f"Erro ao executar '{command}': ({error}) {error_details}")
-            return response
-            
+                self.metrics.record_esr_error()
+                error_details = self.__exchange(b"ALLE?\n", self.read_response).strip()
+                raise TektronixError(f"Erro ao executar '{'; '.join(commands)}': ({error}) {error_details}")
+            self.__settings.update(written)
+            return out_list
+
         except SerialException as e:
-            logger.error(f'Falha ao enviar comando {command}: {e}')
-            return ''
+            self.reset_settings_cache()
+            logger.error(f'Falha ao enviar comandos {commands}: {e}')
+            return []
+        except Exception:
+            self.reset_settings_cache()  # Não se sabe quais configurações foram aplicadas
+            self.discard_input()  # O restante da resposta não pode ser lido pela próxima troca
+            raise
 
-    def commands(self, commands:list[str]) -> list[str]:
-        out_list = []
-        for cmd in commands:
-            out = self.command(cmd)
-            if out:
-                out_list.append(out)
-        return out_list
+    def __exchange(self, message: bytes, reader):
+        """Envia uma mensagem terminada em consulta e lê a resposta, registrando bytes e latência."""
+        sent = time.perf_counter()
+        self.__ser.write(message)
+        self.metrics.record_write(message)
+        response = reader()
+        size = self.__curve_bytes if isinstance(response, np.ndarray) else len(response)
+        self.metrics.record_response(self.metrics.headers(message)[-1], size, time.perf_counter() - sent)
+        return response
+
+    def discard_input(self, quiet: float | None = None) -> int:
+        """
+        Descarta o restante de uma resposta interrompida (cabeçalho inválido, timeout no meio do
+        bloco, buffer pequeno), esperando a linha ficar em silêncio para que os bytes ainda em
+        trânsito não sejam lidos como a resposta da próxima consulta.
+
+        Parâmetros:
+            quiet (float, opcional): Tempo sem bytes recebidos, em segundos, que encerra o descarte.
+                Padrão: 50 ms mais o tempo de transmissão de 100 bytes.
+
+        Retorna:
+            int: Número de bytes descartados.
+        """
+        if quiet is None:
+            quiet = 0.05 + 1000 / self.__ser.baudrate
+        discarded = 0
+        try:
+            deadline = time.perf_counter() + quiet
+            while time.perf_counter() < deadline:
+                waiting = self.__ser.in_waiting
+                if waiting:
+                    discarded += len(self.__ser.read(waiting))
+                    deadline = time.perf_counter() + quiet
+                else:
+                    time.sleep(0.005)
+            self.__ser.reset_input_buffer()
+        except (SerialException, OSError) as e:
+            logger.debug(f'Falha ao descartar a entrada: {e}')
+        if discarded:
+            logger.warning(f'{discarded} bytes de uma resposta interrompida descartados')
+        return discarded
 
     def read_response(self) -> str:
         if not self.__ser.is_open:
             raise Exception("Porta não disponível")
         response = self.__ser.readline().decode()
         self.__ser.flush()
-        logger.debug(f'Resposta lida: {response}')
+        if not response.endswith('\n'):
+            # Toda resposta esperada vem de uma consulta: sem o terminador, ela se perdeu ou chegará
+            # atrasada, e seria lida como a resposta da próxima consulta
+            self.metrics.record_timeout()
+            self.discard_input()
+            raise TektronixError(f"Resposta incompleta ou ausente: {response!r}")
+        if self.log_payload:
+            payload = response.strip()
+            if len(payload) > self.log_payload:
+                payload = f'{payload[:self.log_payload]}... ({len(response)} bytes)'
+            logger.debug(f'Resposta lida: {payload}')
         return response
 
+    def __read_available(self, limit: int, minimum=1) -> int:
+        """
+        Número de bytes a pedir na próxima leitura: os que já chegaram, ao menos `minimum` e no
+        máximo `limit` (os bytes restantes da resposta, quando conhecidos) e CHUNK_SIZE.
+        """
+        return min(max(self.__ser.in_waiting, minimum), limit, self.CHUNK_SIZE)
+
+    def read_block(self, out: bytearray | None = None, progress=None) -> bytearray:
+        """
+        Lê um bloco binário no formato IEEE 488.2 (#<n><tamanho><dados>) direto para um buffer.
+
+        Os dados são lidos em partes, conforme chegam, então o timeout da porta vale para o
+        intervalo entre bytes e não para o bloco inteiro.
+
+        Parâmetros:
+            out (bytearray, opcional): Buffer pré-alocado para receber os dados. Se não for
+                fornecido, um novo bytearray do tamanho do bloco é criado.
+            progress (callable, opcional): Chamada após cada parte com (bytes recebidos, tamanho do bloco).
+
+        Retorna:
+            O bytearray criado, ou uma memoryview sobre os bytes recebidos em `out`.
+        """
+        if not self.__ser.is_open:
+            raise TektronixError("Porta não disponível")
+
+        # Em caso de erro, o restante do bloco é descartado antes da exceção, para não ser lido
+        # como a resposta da próxima consulta
+        header = self.__ser.read(2)
+        if len(header) < 2 or header[:1] != b'#' or not header[1:2].isdigit():
+            self.discard_input()
+            raise TektronixError(f"Cabeçalho de bloco binário inválido: {header!r}")
+        digits = self.__ser.read(int(header[1:2]))
+        if not digits.isdigit():
+            self.discard_input()
+            raise TektronixError(f"Tamanho de bloco binário inválido: {digits!r}")
+        length = int(digits)
+
+        allocated = out is None
+        if allocated:
+            out = bytearray(length)
+        elif len(out) < length:
+            self.discard_input()
+            raise TektronixError(f"Buffer de {len(out)} bytes insuficiente para bloco de {length} bytes")
+
+        view = memoryview(out)
+        received = 0
+        while received < length:
+            count = self.__ser.readinto(view[received:received + self.__read_available(length - received, 64)])
+            if not count:
+                self.metrics.record_timeout()
+                self.discard_input()
+                raise TektronixError(f"Bloco binário incompleto: {received} de {length} bytes recebidos")
+            received += count
+            if progress:
+                progress(received, length)
+
+        self.__ser.readline()  # Consome o terminador de linha após o bloco
+        logger.debug(f'Bloco binário lido: {length} bytes')
+        return out if allocated else view[:length]
+
+    def read_curve(self, out: np.ndarray | None = None, progress=None) -> np.ndarray:
+        """
+        Lê a resposta do CURV? em partes, decodificando os pontos à medida que os bytes chegam.
+
+        Os pontos são gravados diretamente em um array pré-alocado: no formato binário, os bytes
+        são lidos para a memória do array; no formato ASCII, cada parte recebida é convertida
+        enquanto a próxima ainda está em transmissão. A resposta nunca é mantida inteira como texto.
+
+        Parâmetros:
+            out (np.ndarray, opcional): Array que recebe os pontos, com o dtype de _record_dtype().
+                Padrão: um novo array do tamanho da janela configurada (set_window).
+            progress (callable, opcional): Chamada após cada parte com (bytes recebidos, total de
+                bytes ou None no formato ASCII). Padrão: self.curve_progress.
+
+        Retorna:
+            np.ndarray: Visão de `out` com os pontos recebidos.
+        """
+        if not self.__ser.is_open:
+            raise TektronixError("Porta não disponível")
+        progress = progress or self.curve_progress
+        if out is None:
+            out = np.empty(self.stop - self.start + 1, dtype=self._record_dtype())
+        if self.binary:
+            block = self.read_block(out=out.view(np.uint8), progress=progress)
+            self.__curve_bytes = len(block)
+            return out[:len(block) // out.itemsize]
+
+        filled = received = 0
+        pending = b''
+        while True:
+            chunk = self.__ser.read_until(b'\n', self.__read_available(self.CHUNK_SIZE, 64))
+            if not chunk:
+                self.metrics.record_timeout()
+                self.discard_input()
+                raise TektronixError(f"Resposta do CURV? incompleta: {received} bytes recebidos")
+            received += len(chunk)
+            data = pending + chunk
+            end = data.find(b'\n')
+            # Converte somente os números completos; o restante aguarda a próxima parte
+            cut = end if end >= 0 else data.rfind(b',')
+            if cut > 0:
+                try:
+                    values = np.fromstring(data[:cut], dtype=out.dtype, sep=',')
+                except ValueError as e:  # Ruído na linha ou um bloco binário inesperado
+                    self.discard_input()
+                    raise TektronixError(f"Resposta do CURV? inválida após {received} bytes: {e}") from e
+                count = min(len(values), len(out) - filled)
+                if count < len(values):
+                    logger.warning(f'CURV? com mais pontos que o buffer ({len(out)}); pontos excedentes descartados')
+                out[filled:filled + count] = values[:count]
+                filled += count
+            pending = data[cut + 1:] if cut >= 0 else data
+            if progress:
+                progress(received, None)
+            if end >= 0:
+                break
+        self.__curve_bytes = received
+        logger.debug(f'CURV? lido: {filled} pontos, {received} bytes')
+        return out[:filled]
+
+    @staticmethod
+    def parse_device_id(response: str) -> dict[str, str]:
+        """Separa a resposta do ID? em modelo, número de série e versão do firmware."""
+        res = response.strip().split(',')
+        return {
+            "Model": res[0],
+            "Serial Number": res[1],
+            "Firmware Version": res[2]
+        }
+
     def device_id(self):
         res = self.command('ID?')
         if res:
-            res = res.strip().split(',')
-            device_info = {
-                "Model": res[0],
-                "Serial Number": res[1],
-                "Firmware Version": res[2]
-            }
+            device_info = self.parse_device_id(res)
             logger.info(f'Informações do dispositivo: {device_info}')
             return device_info
         logger.warning('Falha ao obter informações do dispositivo')
         return None 
     
+    def acquisition_count(self) -> int | None:
+        """
+        Número de registros adquiridos desde o último ACQ:STATE RUN (ACQ:NUMAC?), ou None se o
+        instrumento não responder. Uma mudança no valor indica que há um registro novo para ler.
+        """
+        res = self.command('ACQ:NUMAC?').strip()
+        return int(res) if res.isdigit() else None
+
     def ch1_freq(self):
         CH1_FREQ = [
             "MEASU:IMM:SOURCE CH1",
@@ -166,91 +730,230 @@ class Tektronix():
         return None    
 
 
-    def ch1_waveform(self):
-        CH1_WAVEFORM = [
-            'DAT:SOU CH1',
-            "DAT:ENC ASCI",    
-            "DAT:WID 2",
-            "DAT:STAR 1",      
-            "DAT:STOP 1000",   
-            "WFMPR?",          
-            "CURV?"            
+    @staticmethod
+    def _data_commands(source: str, encoding: str, width: int, start: int, stop: int) -> list[str]:
+        """Comandos DAT que selecionam a fonte, o formato e a janela dos dados de CURV?."""
+        return [
+            f'DAT:SOU {source}',
+            f"DAT:ENC {encoding}",
+            f"DAT:WID {width}",
+            f"DAT:STAR {start}",
+            f"DAT:STOP {stop}"
         ]
+
+    def __data_setup(self, source: str) -> list[str]:
+        return self._data_commands(source, self.encoding, self.width, self.start, self.stop)
+
+    # Lote de captura e cache de preâmbulos, compartilhados com o AsyncTektronix
+    @classmethod
+    def _check_sources(cls, sources) -> list[str]:
+        sources = [source.upper() for source in sources]
+        for source in sources:
+            if source not in cls.SOURCES:
+                raise ValueError(f"Fonte inválida: {source}. Use {', '.join(cls.SOURCES)}")
+        return sources
+
+    @classmethod
+    def _acquire_batch(cls, sources: list[str], freeze: bool, data_setup) -> list[str]:
+        """Lote de acquire(): configuração DAT, consulta às escalas (ou WFMPR?) e CURV? de cada fonte."""
+        batch = ["ACQ:STATE STOP"] if freeze else []
+        for source in sources:
+            batch += data_setup(source)
+            batch += [cls.PREAMBLE_CHECKS.get(source, "WFMPR?"), "CURV?"]
+        return batch
+
+    @staticmethod
+    def _is_running(response: str) -> bool:
+        """Interpreta a resposta do ACQ:STATE?."""
+        return response.strip().upper() not in ('', '0', 'OFF', 'STOP')
+
+    @classmethod
+    def _cached_preambles(cls, cache: dict, keys: dict, responses: list) -> tuple[dict, dict]:
+        """
+        Separa os preâmbulos das respostas do lote de acquire() (uma resposta por fonte, antes do CURV?).
+
+        Parâmetros:
+            cache (dict): Cache de preâmbulos, chave -> (resposta das escalas, WFMPR?).
+            keys (dict): Fonte -> chave do cache (fonte e configuração de aquisição).
+            responses (list): Resposta das escalas (ou o WFMPR?) de cada fonte, na ordem de `keys`.
+
+        Retorna:
+            tuple: (fonte -> preâmbulo já conhecido, fonte -> (chave, resposta das escalas) dos
+            preâmbulos que precisam de um novo WFMPR?).
+        """
+        preambles, stale = {}, {}
+        for (source, key), first in zip(keys.items(), responses):
+            cached = cache.get(key)
+            if source not in cls.PREAMBLE_CHECKS:
+                preambles[source] = first
+            elif cached and cached[0] == first:
+                logger.debug(f'Preâmbulo de {source} reaproveitado do cache')
+                preambles[source] = cached[1]
+            else:
+                stale[source] = (key, first)
+        return preambles, stale
+
+    @staticmethod
+    def _preamble_batch(stale: dict) -> list[str]:
+        """Lote que repete o WFMPR? das fontes cujo preâmbulo mudou."""
+        batch = []
+        for source in stale:
+            batch += [f'DAT:SOU {source}', "WFMPR?"]
+        return batch
+
+    @staticmethod
+    def _store_preambles(cache: dict, preambles: dict, stale: dict, responses: list):
+        """Guarda no cache e em `preambles` os WFMPR? recebidos para as fontes de `stale`."""
+        for (source, (key, signature)), preamble in zip(stale.items(), responses):
+            cache[key] = (signature, preamble)
+            preambles[source] = preamble
+
+    def reset_preamble_cache(self):
+        """Descarta os preâmbulos (WFMPR?) em cache, forçando uma nova consulta na próxima captura."""
+        self.__preambles.clear()
+        logger.debug('Cache de preâmbulos descartado')
+
+    def acquire(self, sources=('CH1', 'CH2'), freeze: bool | None = None) -> dict[str, Waveform]:
+        """
+        Captura várias fontes em uma única sequência de comandos, compartilhando a configuração DAT.
+
+        Com `freeze`, a aquisição é parada (ACQ:STATE STOP) antes da leitura, então todas as fontes
+        vêm do mesmo evento de disparo; o estado anterior é restaurado ao final.
+
+        O preâmbulo (WFMPR?) fica em cache por fonte e configuração de aquisição. Em vez de repeti-lo
+        a cada captura, uma consulta curta às escalas (PREAMBLE_CHECKS) é enviada no mesmo lote do
+        CURV? e o WFMPR? só é repetido quando a resposta muda.
+
+        Parâmetros:
+            sources (list[str], opcional): Fontes a capturar (CH1, CH2, MATH, REF1 ou REF2).
+            freeze (bool, opcional): Congela a aquisição durante a leitura. Padrão: True para mais de uma fonte.
+
+        Retorna:
+            dict: Waveform de cada fonte capturada, na ordem pedida. Vazio em caso de falha.
+        """
+        sources = self._check_sources(sources)
+        if freeze is None:
+            freeze = len(sources) > 1
+        # O estado é consultado em uma troca própria: se o lote de captura falhar, o STOP já pode ter
+        # sido executado e a aquisição precisa ser retomada mesmo sem nenhuma resposta do lote
+        running = freeze and self._is_running(self.command("ACQ:STATE?"))
+        batch = self._acquire_batch(sources, running, self.__data_setup)
+
+        try:
+            res = self.commands(batch)
+            if len(res) != len(sources) * 2:
+                logger.warning(f'Resposta incompleta ao capturar {sources}')
+                return {}
+
+            curves = dict(zip(sources, res[1::2]))
+            keys = {source: (source, self.encoding, self.width, self.start, self.stop) for source in sources}
+            preambles, stale = self._cached_preambles(self.__preambles, keys, res[::2])
+            if stale:
+                res = self.commands(self._preamble_batch(stale))
+                if len(res) != len(stale):
+                    logger.warning(f'Falha ao obter o preâmbulo de {list(stale)}')
+                    return {}
+                self._store_preambles(self.__preambles, preambles, stale, res)
+        finally:
+            if running:
+                try:
+                    self.commands(["ACQ:STATE RUN"])
+                except TektronixError as e:
+                    logger.error(f'Falha ao retomar a aquisição: {e}')
+
+        return {
+            source: Waveform(preambles[source], curves[source], start=self.start, stride=self.stride)
+            for source in sources
+        }
+
+    def ch1_waveform(self):
         logger.info('Obtendo waveform do canal 1')
-        res = self.commands(CH1_WAVEFORM)
-        if res:
-            return Waveform(res[0], res[1]) 
+        waveform = self.acquire(['CH1'], freeze=False).get('CH1')
+        if waveform:
+            return waveform
         logger.warning('Falha ao obter waveform do canal 1')
         return None
 
     def ch2_waveform(self):
-        CH2_WAVEFORM = [
-            'DAT:SOU CH2',
-            "DAT:ENC ASCI",    
-            "DAT:WID 2",       
-            "DAT:STAR 1",      
-            "DAT:STOP 1000",   
-            "WFMPR?",          
-            "CURV?"            
-        ]
         logger.info('Obtendo waveform do canal 2')
-        res = self.commands(CH2_WAVEFORM)
-        if res:
-            return Waveform(res[0], res[1])
+        waveform = self.acquire(['CH2'], freeze=False).get('CH2')
+        if waveform:
+            return waveform
         logger.warning('Falha ao obter waveform do canal 2')
         return None
 
     def math_waveform(self):
-        MATH_WAVEFORM = [
-            'DAT:SOU MATH',
-            "DAT:ENC ASCI",    
-            "DAT:WID 2",       
-            "DAT:STAR 1",      
-            "DAT:STOP 1000",   
-            "WFMPR?",          
-            "CURV?"            
-        ]
         logger.info('Obtendo waveform matemática')
-        res = self.commands(MATH_WAVEFORM)
-        if res:
-            return Waveform(res[0], res[1])
+        waveform = self.acquire(['MATH'], freeze=False).get('MATH')
+        if waveform:
+            return waveform
         logger.warning('Falha ao obter waveform matemática')
         return None
 
     def ref1_waveform(self):
-        REF1_WAVEFORM = [
-            'DAT:SOU REF1',
-            "DAT:ENC ASCI",    
-            "DAT:WID 2",       
-            "DAT:STAR 1",      
-            "DAT:STOP 1000",   
-            "WFMPR?",          
-            "CURV?"            
-        ]
         logger.info('Obtendo waveform de referência 1')
-        res = self.commands(REF1_WAVEFORM)
-        if res:
-            return Waveform(res[0], res[1])
+        waveform = self.acquire(['REF1'], freeze=False).get('REF1')
+        if waveform:
+            return waveform
         logger.warning('Falha ao obter waveform de referência 1')
         return None
 
     def ref2_waveform(self):
-        REF2_WAVEFORM = [
-            'DAT:SOU REF2',
-            "DAT:ENC ASCI",    
-            "DAT:WID 2",       
-            "DAT:STAR 1",      
-            "DAT:STOP 1000",   
-            "WFMPR?",          
-            "CURV?"            
-        ]
         logger.info('Obtendo waveform de referência 2')
-        res = self.commands(REF2_WAVEFORM)
-        if res:
-            return Waveform(res[0], res[1])
+        waveform = self.acquire(['REF2'], freeze=False).get('REF2')
+        if waveform:
+            return waveform
         logger.warning('Falha ao obter waveform de referência 2')
         return None
 
+    def _record_dtype(self) -> np.dtype:
+        """Tipo NumPy dos pontos de CURV? na codificação e largura configuradas."""
+        if not self.binary:
+            return np.dtype(np.int32)
+        kind = 'u' if self.encoding == 'RPB' else 'i'
+        return np.dtype(f">{kind}{self.width}")
+
+    def stream(self, source='CH1', capacity=100, count=None, buffer: RingBuffer | None = None):
+        """
+        Adquire continuamente a forma de onda de uma fonte, o mais rápido que o link permitir.
+
+        Cada registro é gravado diretamente em uma linha de um RingBuffer pré-alocado (o mais antigo
+        é descartado quando o buffer enche) e a visão desse registro é produzida pelo gerador.
+        A configuração DAT e o preâmbulo (WFMPR?) são enviados uma única vez; o preâmbulo fica em
+        `buffer.preamble` para construir objetos Waveform quando necessário. Os registros cobrem a
+        janela configurada em set_window(), sem decimação; passe `start` e `stride` à Waveform para
+        obter o eixo de tempo correto e os pontos decimados.
+
+        Parâmetros:
+            source (str, opcional): Fonte da aquisição (CH1, CH2, MATH, REF1 ou REF2).
+            capacity (int, opcional): Capacidade do buffer criado quando `buffer` não é fornecido.
+            count (int, opcional): Número de registros a adquirir. Se None, adquire indefinidamente.
+            buffer (RingBuffer, opcional): Buffer a ser usado; sua taxa (`rate()`) mede a vazão sustentada.
+        """
+        STREAM_SETUP = self.__data_setup(source) + ["WFMPR?"]
+        record_length = self.stop - self.start + 1
+        if buffer is None:
+            buffer = RingBuffer(capacity, record_length, dtype=self._record_dtype())
+        elif buffer.dtype != self._record_dtype():
+            raise ValueError(f"O buffer deve ter dtype {self._record_dtype()}")
+
+        res = self.commands(STREAM_SETUP)
+        if not res:
+            raise TektronixError(f"Falha ao configurar a aquisição contínua de {source}")
+        buffer.preamble = res[0]
+        logger.info(f'Iniciando aquisição contínua de {source}')
+
+        acquired = 0
+        try:
+            while count is None or acquired < count:
+                slot = buffer.next_slot()
+                points = self.__exchange(b"CURV?\n", lambda: self.read_curve(out=slot))
+                acquired += 1
+                yield buffer.commit(len(points))
+        finally:
+            logger.info(f'Aquisição contínua de {source} encerrada: {acquired} registros, '
+                        f'{buffer.rate():.2f} registros/s')
+
     def event_log(self):
         EVENT_LOG = [
             "*ESR?",
@@ -0,0 +1,253 @@
+import time
+import bisect
+import logging
+import threading
+import numpy as np
+
+
+def configure_logging(level=logging.DEBUG, file_name: str | None = 'tektronix.log'):
+    """
+    Configura o logging da aplicação: console e, opcionalmente, o arquivo de log.
+
+    Os módulos de `src` não configuram o logging ao serem importados; as aplicações (app.py,
+    scripts) chamam esta função na inicialização.
+    """
+    handlers = [logging.StreamHandler()]  # Log para o console
+    if file_name:
+        handlers.append(logging.FileHandler(file_name))  # Log para arquivo
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+
+
+class RingBuffer:
+    """
+    Buffer circular de capacidade fixa para registros de forma de onda.
+
+    Toda a memória é alocada na criação: cada registro ocupa uma linha de um array NumPy
+    (capacity x record_length). Quando o buffer está cheio, o registro mais antigo é sobrescrito.
+    """
+    def __init__(self, capacity: int, record_length: int, dtype='>i2'):
+        """
+        Parâmetros:
+            capacity (int): Número máximo de registros mantidos no buffer.
+            record_length (int): Número de pontos de cada registro.
+            dtype (str | np.dtype, opcional): Tipo dos pontos armazenados. Padrão: inteiro de 16 bits big-endian.
+        """
+        if capacity < 1 or record_length < 1:
+            raise ValueError("A capacidade e o tamanho do registro devem ser maiores que zero")
+        self.capacity = capacity
+        self.record_length = record_length
+        self.preamble: str | None = None  # Resposta do WFMPR? válida para os registros do buffer
+        self._data = np.zeros((capacity, record_length), dtype=dtype)
+        self._lengths = np.zeros(capacity, dtype=np.int64)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._count = 0
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def total(self) -> int:
+        """Número total de registros inseridos desde a criação do buffer."""
+        return self._count
+
+    @property
+    def dropped(self) -> int:
+        """Número de registros descartados por falta de espaço."""
+        return max(self._count - self.capacity, 0)
+
+    def next_slot(self) -> np.ndarray:
+        """Retorna a linha que será ocupada pelo próximo registro, para preenchimento sem cópia."""
+        return self._data[self._count % self.capacity]
+
+    def commit(self, length: int | None = None, timestamp: float | None = None) -> np.ndarray:
+        """
+        Confirma o registro escrito em next_slot() e retorna a visão com os pontos válidos.
+
+        Parâmetros:
+            length (int, opcional): Número de pontos válidos. Padrão: o registro inteiro.
+            timestamp (float, opcional): Instante da aquisição. Padrão: time.time().
+        """
+        index = self._count % self.capacity
+        length = self.record_length if length is None else length
+        self._lengths[index] = length
+        self._timestamps[index] = time.time() if timestamp is None else timestamp
+        self._count += 1
+        return self._data[index, :length]
+
+    def append(self, record, timestamp: float | None = None) -> np.ndarray:
+        """Copia um registro para o buffer, descartando o mais antigo se necessário."""
+        record = np.asarray(record)
+        if len(record) > self.record_length:
+            raise ValueError(f"Registro com {len(record)} pontos excede o limite de {self.record_length}")
+        self.next_slot()[:len(record)] = record
+        return self.commit(len(record), timestamp)
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def _index(self, position: int) -> int:
+        size = len(self)
+        if position < 0:
+            position += size
+        if not 0 <= position < size:
+            raise IndexError("Índice fora do buffer")
+        return (self._count - size + position) % self.capacity
+
+    def __getitem__(self, position: int) -> np.ndarray:
+        """Retorna o registro na posição indicada (0 é o mais antigo, -1 o mais recente)."""
+        index = self._index(position)
+        return self._data[index, :self._lengths[index]]
+
+    def __iter__(self):
+        """Itera sobre os registros do mais antigo para o mais recente."""
+        for position in range(len(self)):
+            yield self[position]
+
+    def timestamp(self, position: int) -> float:
+        """Retorna o instante de aquisição do registro na posição indicada."""
+        return float(self._timestamps[self._index(position)])
+
+    def latest(self) -> np.ndarray | None:
+        """Retorna o registro mais recente, ou None se o buffer estiver vazio."""
+        return self[-1] if len(self) else None
+
+    def rate(self) -> float:
+        """Taxa média de registros por segundo entre os registros presentes no buffer."""
+        if len(self) < 2:
+            return 0.0
+        elapsed = self.timestamp(-1) - self.timestamp(0)
+        return (len(self) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def clear(self):
+        """Descarta todos os registros, mantendo a memória alocada."""
+        self._count = 0
+
+
+class LinkMetrics:
+    """
+    Métricas leves da comunicação com o instrumento: contagem de comandos, bytes enviados e
+    recebidos, histogramas de latência das consultas, tempos esgotados e erros de *ESR?.
+
+    Os métodos record_* são chamados pelo Tektronix a cada troca pela porta serial; o acesso é
+    protegido por um lock para permitir a leitura a partir de outra thread.
+    """
+    # Limites superiores, em segundos, das faixas do histograma de latência
+    LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, float('inf'))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._summary_active = False
+        self.reset()
+
+    def reset(self):
+        """Zera todas as métricas."""
+        with self._lock:
+            self.commands: dict[str, int] = {}
+            self.latency: dict[str, dict] = {}
+            self.bytes_out = 0
+            self.bytes_in = 0
+            self.timeouts = 0
+            self.esr_errors = 0
+            self.started = time.time()
+
+    @staticmethod
+    def headers(message: bytes) -> list[str]:
+        """Cabeçalhos dos comandos de uma mensagem (por exemplo, ['DAT:SOU', 'CURV?'])."""
+        text = message.decode(errors='replace').strip()
+        return [cmd.strip().lstrip(':').split(' ')[0].upper() for cmd in text.split(';') if cmd.strip()]
+
+    def record_write(self, message: bytes):
+        with self._lock:
+            self.bytes_out += len(message)
+            for header in self.headers(message):
+                self.commands[header] = self.commands.get(header, 0) + 1
+
+    def record_response(self, header: str, size: int, latency: float):
+        """Registra a resposta de uma consulta e o tempo entre o envio e o fim da leitura."""
+        with self._lock:
+            self.bytes_in += size
+            stats = self.latency.get(header)
+            if stats is None:
+                stats = self.latency[header] = {
+                    "count": 0, "total": 0.0, "min": float('inf'), "max": 0.0,
+                    "buckets": [0] * len(self.LATENCY_BUCKETS)
+                }
+            stats["count"] += 1
+            stats["total"] += latency
+            stats["min"] = min(stats["min"], latency)
+            stats["max"] = max(stats["max"], latency)
+            stats["buckets"][bisect.bisect_left(self.LATENCY_BUCKETS, latency)] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_esr_error(self):
+        with self._lock:
+            self.esr_errors += 1
+
+    def snapshot(self) -> dict:
+        """Retorna uma cópia das métricas atuais."""
+        with self._lock:
+            return {
+                "elapsed": time.time() - self.started,
+                "commands": dict(self.commands),
+                "bytes_out": self.bytes_out,
+                "bytes_in": self.bytes_in,
+                "timeouts": self.timeouts,
+                "esr_errors": self.esr_errors,
+                "latency": {
+                    header: {**stats, "mean": stats["total"] / stats["count"], "buckets": list(stats["buckets"])}
+                    for header, stats in self.latency.items()
+                },
+                "latency_buckets": list(self.LATENCY_BUCKETS),
+            }
+
+    def summary(self) -> str:
+        """Resumo das métricas em texto, com a latência média e máxima de cada consulta."""
+        data = self.snapshot()
+        lines = [
+            f"{data['elapsed']:.1f} s: {sum(data['commands'].values())} comandos, "
+            f"{data['bytes_out']} bytes enviados, {data['bytes_in']} bytes recebidos, "
+            f"{data['timeouts']} tempos esgotados, {data['esr_errors']} erros de ESR"
+        ]
+        for header, stats in sorted(data["latency"].items()):
+            lines.append(f"  {header}: {stats['count']}x, média {stats['mean'] * 1e3:.1f} ms, "
+                         f"máx {stats['max'] * 1e3:.1f} ms")
+        return '\n'.join(lines)
+
+    def start_periodic_summary(self, interval: float, log=None):
+        """
+        Registra o resumo das métricas a cada `interval` segundos, em uma thread daemon.
+
+        Parâmetros:
+            interval (float): Intervalo entre os resumos, em segundos.
+            log (callable, opcional): Função que recebe o resumo. Padrão: logging.info.
+        """
+        self.stop_periodic_summary()
+        log = log or logging.info
+
+        def run():
+            log(self.summary())
+            if not self._summary_active:
+                return
+            self._timer = threading.Timer(interval, run)
+            self._timer.daemon = True
+            self._timer.start()
+
+        self._summary_active = True
+        self._timer = threading.Timer(interval, run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop_periodic_summary(self):
+        self._summary_active = False
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
@@ -1,30 +1,59 @@
 import csv
 import datetime
 import os
-import io
-import matplotlib.pyplot as plt
+import re
+import json
+import struct
+import functools
+import numpy as np
 import logging
+from .render import WaveformRenderer
 
-# Configuração básica do logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Formato binário .wfb: assinatura, tamanho do cabeçalho (uint32 little-endian), cabeçalho JSON
+# com o preâmbulo e a janela, e os pontos de CURV? sem decimação, alinhados em 8 bytes.
+WFB_MAGIC = b'TK340WF1'
+WFB_LENGTH = struct.Struct('<I')
+FILE_FORMATS = ('txt', 'csv', 'wfb')
 
 class Waveform:
-    def __init__(self, wfmpr_response: str, curv_response: str = None, output_dir='waveform_data'):
+    def __init__(self, wfmpr_response: str, curv_response: str | bytes | np.ndarray = None, output_dir='waveform_data',
+                 start: int = 1, stride: int = 1):
         """
         Inicializa a classe com a resposta do comando WFMPR? e CURV?.
         
         Parâmetros:
             wfmpr_response (str): Resposta bruta do comando WFMPR?.
-            curv_response (str, opcional): Resposta bruta do comando CURV?.
+            curv_response (str | bytes | np.ndarray, opcional): Resposta bruta do comando CURV?, em
+                texto (DAT:ENC ASCI), o bloco binário já sem o cabeçalho (DAT:ENC RIB/RPB) ou um
+                array de pontos (por exemplo, um registro de RingBuffer).
             output_dir (str, opcional): Diretório padrão para salvar arquivos.
+            start (int, opcional): Posição no registro do instrumento do primeiro ponto de CURV? (DAT:STAR).
+            stride (int, opcional): Mantém um ponto a cada `stride` dos dados de CURV?.
         """
+        self.start = start
+        self.stride = stride
         self.raw_data = wfmpr_response
-        self.curv_data = curv_response
+        self.curv_data = curv_response  # Também reinicia os caches de conversão
         self.parsed_data = self._parse_response()
-        self.output_dir = output_dir
-        os.makedirs(self.output_dir, exist_ok=True)
-        logging.info(f"Waveform inicializada com sucesso. Diretório de saída: {self.output_dir}")
+        self.output_dir = output_dir  # Criado somente ao salvar um arquivo
+        logging.debug(f"Waveform inicializada com sucesso. Diretório de saída: {self.output_dir}")
     
+    @property
+    def curv_data(self):
+        """Resposta bruta do comando CURV? (texto ou binário), lida do arquivo no primeiro acesso se adiada."""
+        if self._curv_loader is not None:
+            loader, self._curv_loader = self._curv_loader, None
+            self._curv_data = loader()
+        return self._curv_data
+
+    @curv_data.setter
+    def curv_data(self, curv_response):
+        self._curv_data = curv_response
+        self._curv_loader = None
+        self._raw_array = None
+        self._voltage_array = None
+        self._time_array = None
+
     def _parse_response(self):
         """
         Processa a resposta do WFMPR? e retorna um dicionário com os parâmetros nomeados.
@@ -41,18 +70,20 @@ class Waveform:
             "Y_UNIT": values[7],
             "X_UNIT": values[8].strip('"'),
             "XINCREMENT": float(values[9]),
-            "XZERO": float(values[10]) * 1e-6,  # Convertendo para segundos
+            # O instrumento informa este campo em relação ao DAT:STAR; somando (start - 1), ele passa a ser
+            # relativo ao registro completo, como em uma captura sem janela
+            "XZERO": (float(values[10]) + self.start - 1) * 1e-6,  # Convertendo para segundos
             "Y_UNIT_2": values[11].strip('"'),
             "YINCREMENT": float(values[12]),
             "YZERO": float(values[13]) * 1e-3,  # Convertendo para volts
             "YMULT": float(values[14])
         }
-        logging.info("Resposta do WFMPR? processada com sucesso.")
+        logging.debug("Resposta do WFMPR? processada com sucesso.")
         return parsed_data
     
     def get_data(self):
         """Retorna os dados processados."""
-        logging.info("Dados processados retornados.")
+        logging.debug("Dados processados retornados.")
         return self.parsed_data
     
     def get_waveform_data(self)->dict[str:str]:
@@ -66,64 +97,139 @@ class Waveform:
             "POINTS": data[4],
             "MODE": data[5]
         }
-        logging.info("Informações da waveform retornadas.")
+        logging.debug("Informações da waveform retornadas.")
         return waveform_data
 
-    def get_raw_curv_data(self):
-        """Retorna os dados brutos de CURV? como um array de inteiros."""
-        if not self.curv_data:
+    def _binary_dtype(self) -> np.dtype:
+        """Retorna o dtype NumPy correspondente ao formato binário descrito no preâmbulo."""
+        width = max(self.parsed_data["BIT_DEPTH"] // 8, 1)
+        kind = 'u' if self.parsed_data["ACQUISITION_MODE"].upper().startswith('RP') else 'i'
+        order = '<' if self.parsed_data["BYTE_ORDER"].upper().startswith('LSB') else '>'
+        return np.dtype(f"{order}{kind}{width}")
+
+    def _curv_points(self) -> np.ndarray:
+        """Interpreta os dados de CURV? (texto, binário ou array) sem decimação e sem cache."""
+        if isinstance(self.curv_data, np.ndarray):
+            return self.curv_data
+        if isinstance(self.curv_data, (bytes, bytearray, memoryview)):
+            return np.frombuffer(self.curv_data, dtype=self._binary_dtype())
+        return np.fromstring(self.curv_data, dtype=np.int32, sep=',')
+
+    @staticmethod
+    def _compact(data_points: np.ndarray) -> np.ndarray:
+        """Converte os pontos para int16 sempre que os valores couberem, ou para int32."""
+        if np.can_cast(data_points.dtype, np.int16):
+            return data_points.astype(np.int16, copy=False)  # Evita percorrer os dados
+        info = np.iinfo(np.int16)
+        if data_points.size == 0 or (data_points.min() >= info.min and data_points.max() <= info.max):
+            return data_points.astype(np.int16)
+        return data_points.astype(np.int32)
+
+    def _decode_curv(self) -> np.ndarray:
+        """
+        Decodifica os dados de CURV? uma única vez em um array NumPy compacto (int16 sempre que
+        os valores couberem), já decimado por `stride`, e mantém o resultado em cache.
+        """
+        if self._raw_array is None:
+            # Sem cópia quando os pontos já são int16 (por exemplo, um .wfb mapeado em memória);
+            # a view impede que o array de origem seja marcado como somente leitura
+            data_points = self._compact(self._curv_points()[::self.stride]).view()
+            data_points.flags.writeable = False
+            self._raw_array = data_points
+        return self._raw_array
+
+    def _has_curv(self) -> bool:
+        """Indica se há dados de CURV? disponíveis."""
+        return self.curv_data is not None and len(self.curv_data) > 0
+
+    def _has_window(self) -> bool:
+        """Indica se os dados vêm de uma janela parcial ou decimada do registro."""
+        return self.start != 1 or self.stride != 1
+
+    def _curv_text(self) -> str:
+        """Retorna os dados de CURV? no formato texto usado pelos arquivos .txt e .csv."""
+        if isinstance(self.curv_data, str):
+            return self.curv_data
+        return ','.join(map(str, self._curv_points().tolist()))
+
+    def get_raw_curv_data(self) -> np.ndarray | None:
+        """Retorna os dados brutos de CURV? como um array NumPy de inteiros (somente leitura)."""
+        if not self._has_curv():
             logging.warning("Nenhum dado CURV? disponível.")
             return None
-        logging.info("Dados brutos de CURV? retornados.")
-        return list(map(int, self.curv_data.split(',')))
+        return self._decode_curv()
 
-    def process_curv_data(self):
-        """Processa os valores de CURV? e retorna uma lista de tensões convertidas."""
-        if not self.curv_data:
+    def process_curv_data(self) -> np.ndarray | None:
+        """
+        Processa os valores de CURV? e retorna um array de tensões convertidas.
+        A conversão é feita uma única vez; as chamadas seguintes retornam o array em cache.
+        """
+        if not self._has_curv():
             logging.warning("Nenhum dado CURV? disponível para processamento.")
             return None
-        
-        data_points = list(map(int, self.curv_data.split(',')))
-        y_increment = self.parsed_data["YINCREMENT"]
-        y_zero = self.parsed_data["YZERO"]
-
-        processed_data = [y_zero + (y_increment * point) for point in data_points]
-        logging.info("Dados CURV? processados com sucesso.")
-        return processed_data
-
-    def get_time_array(self):
-        """Retorna um array de tempo correspondente aos pontos da forma de onda."""
-        num_points = self.parsed_data["NUM_POINTS"]
-        x_increment = self.parsed_data["XINCREMENT"]
-        x_zero = self.parsed_data["XZERO"]
-        
-        time_array = [x_zero + i * x_increment for i in range(num_points)]
-        logging.info("Array de tempo gerado com sucesso.")
-        return time_array
+
+        if self._voltage_array is None:
+            y_increment = self.parsed_data["YINCREMENT"]
+            y_zero = self.parsed_data["YZERO"]
+
+            voltage = y_zero + y_increment * self._decode_curv().astype(np.float64)
+            voltage.flags.writeable = False
+            self._voltage_array = voltage
+            logging.info("Dados CURV? processados com sucesso.")
+        return self._voltage_array
+
+    def get_time_array(self) -> np.ndarray:
+        """
+        Retorna um array de tempo correspondente aos pontos da forma de onda.
+        O array é calculado uma única vez e mantido em cache.
+        """
+        if self._time_array is None:
+            if self._has_curv():
+                num_points = len(self._decode_curv())
+            else:
+                num_points = -(-self.parsed_data["NUM_POINTS"] // self.stride)
+            x_increment = self.parsed_data["XINCREMENT"]
+            x_zero = self.parsed_data["XZERO"]
+
+            # O primeiro ponto de uma janela parcial está deslocado de (start - 1) amostras
+            indexes = (self.start - 1) + np.arange(num_points, dtype=np.float64) * self.stride
+            time_array = x_zero + indexes * x_increment
+            time_array.flags.writeable = False
+            self._time_array = time_array
+            logging.info("Array de tempo gerado com sucesso.")
+        return self._time_array
+
+    def _sample_range(self) -> tuple[int, int]:
+        """Menor e maior valor de CURV? no formato do preâmbulo: RP sem sinal, RI com sinal."""
+        bit_depth = self.parsed_data["BIT_DEPTH"]
+        if self.parsed_data["ACQUISITION_MODE"].upper().startswith('RP'):
+            return 0, (2 ** bit_depth) - 1
+        return -(2 ** (bit_depth - 1)), (2 ** (bit_depth - 1)) - 1
 
     def get_voltage_max(self):
         """Retorna o limite superior dos valores de CURV? convertidos em tensão."""
-        bit_depth = self.parsed_data["BIT_DEPTH"]
-        max_value = (2 ** (bit_depth - 1)) - 1  # Assumindo valores com sinal
+        max_value = self._sample_range()[1]
         voltage_max = self.parsed_data["YZERO"] + (self.parsed_data["YINCREMENT"] * max_value)
         logging.info(f"Limite superior de tensão calculado: {voltage_max} V")
         return voltage_max
     
     def get_voltage_min(self):
         """Retorna o limite inferior dos valores de CURV? convertidos em tensão."""
-        bit_depth = self.parsed_data["BIT_DEPTH"]
-        min_value = -(2 ** (bit_depth - 1))  # Assumindo valores com sinal
+        min_value = self._sample_range()[0]
         voltage_min = self.parsed_data["YZERO"] + (self.parsed_data["YINCREMENT"] * min_value)
         logging.info(f"Limite inferior de tensão calculado: {voltage_min} V")
         return voltage_min
 
     def save_to_file(self, file_format='txt', name: str | None = None, output_dir: str | None = None):
         """
-        Salva os dados brutos de WFMPR? e CURV? em um arquivo .txt ou .csv.
-        
+        Salva os dados brutos de WFMPR? e CURV? em um arquivo .txt, .csv ou .wfb.
+
+        O formato .wfb é binário: guarda o preâmbulo já interpretado e os pontos como inteiros,
+        ocupando menos da metade do .txt, e é lido com numpy.memmap sem interpretar texto.
+
         Parâmetros:
             name (str, opcional): Nome do arquivo. Se não for fornecido, usa a data e hora atual.
-            file_format (str, opcional): Formato do arquivo ('txt' ou 'csv'). Padrão é 'txt'.
+            file_format (str, opcional): Formato do arquivo ('txt', 'csv' ou 'wfb'). Padrão é 'txt'.
             output_dir (str, opcional): Diretório onde o arquivo será salvo. Se não for fornecido, usa o diretório padrão.
         """
         if not name:
@@ -141,43 +247,158 @@ class Waveform:
         if file_format == 'txt':
             with open(file_path, 'w') as file:
                 file.write(self.raw_data + '\n')
-                if self.curv_data:
-                    file.write(self.curv_data + '\n')
+                # A linha de CURV? é sempre escrita (vazia sem pontos) para a janela ficar na terceira linha
+                file.write((self._curv_text() if self._has_curv() else '') + '\n')
+                if self._has_window():
+                    file.write(f"{self.start};{self.stride}\n")
             logging.info(f"Dados salvos em {file_path} no formato TXT.")
         elif file_format == 'csv':
             with open(file_path, 'w', newline='') as file:
                 writer = csv.writer(file)
                 writer.writerow(["WFMPR Data", self.raw_data])
-                if self.curv_data:
-                    writer.writerow(["CURV Data", self.curv_data])
+                writer.writerow(["CURV Data", self._curv_text() if self._has_curv() else ''])
+                if self._has_window():
+                    writer.writerow(["Window", self.start, self.stride])
             logging.info(f"Dados salvos em {file_path} no formato CSV.")
+        elif file_format == 'wfb':
+            with open(file_path, 'wb') as file:
+                self._write_wfb(file)
+            logging.info(f"Dados salvos em {file_path} no formato WFB.")
         else:
-            logging.error("Formato de arquivo inválido. Use 'txt' ou 'csv'.")
-            raise ValueError("Formato de arquivo inválido. Use 'txt' ou 'csv'.")
-    
+            logging.error("Formato de arquivo inválido. Use 'txt', 'csv' ou 'wfb'.")
+            raise ValueError("Formato de arquivo inválido. Use 'txt', 'csv' ou 'wfb'.")
+
+    def _wfb_samples(self) -> np.ndarray:
+        """Pontos de CURV? sem decimação, como inteiros little-endian."""
+        if not self._has_curv():
+            return np.empty(0, dtype='<i2')
+        data_points = self._curv_points()
+        if data_points.dtype.kind not in 'iu' or data_points.dtype.itemsize > 2:
+            data_points = self._compact(data_points)  # Dados em texto: int16 sempre que couberem
+        return data_points.astype(data_points.dtype.newbyteorder('<'), copy=False)
+
+    def _write_wfb(self, file, **fields) -> int:
+        """
+        Escreve a waveform no formato .wfb em um arquivo binário aberto; retorna o número de bytes.
+        Os `fields` adicionais são gravados no cabeçalho (por exemplo, o instante da captura).
+        """
+        samples = self._wfb_samples()
+        header = json.dumps({
+            "wfmpr": self.raw_data,
+            "preamble": self.parsed_data,
+            "start": self.start,
+            "stride": self.stride,
+            "dtype": samples.dtype.str,
+            "points": len(samples),
+            **fields,
+        }).encode()
+        # Completa o cabeçalho com espaços para os pontos começarem em um múltiplo de 8 bytes
+        header += b' ' * (-(len(WFB_MAGIC) + WFB_LENGTH.size + len(header)) % 8)
+        file.write(WFB_MAGIC + WFB_LENGTH.pack(len(header)) + header)
+        file.write(samples.tobytes())
+        return len(WFB_MAGIC) + WFB_LENGTH.size + len(header) + samples.nbytes
+
+    @staticmethod
+    def _read_wfb_header(file) -> tuple[dict, int]:
+        """Lê um cabeçalho .wfb na posição atual do arquivo; retorna o cabeçalho e o tamanho lido."""
+        prefix = file.read(len(WFB_MAGIC) + WFB_LENGTH.size)
+        if prefix[:len(WFB_MAGIC)] != WFB_MAGIC:
+            raise ValueError("Arquivo .wfb inválido: assinatura não encontrada.")
+        (length,) = WFB_LENGTH.unpack(prefix[len(WFB_MAGIC):])
+        return json.loads(file.read(length)), len(prefix) + length
+
+    @staticmethod
+    def _from_wfb(file_name: str, lazy=False) -> 'Waveform':
+        """Cria uma Waveform a partir de um arquivo .wfb, mapeando os pontos com numpy.memmap."""
+        with open(file_name, 'rb') as file:
+            header, offset = Waveform._read_wfb_header(file)
+        curv_loader = functools.partial(Waveform._map_wfb_samples, file_name, header, offset)
+        if not lazy:
+            return Waveform(header["wfmpr"], curv_loader(), start=header["start"], stride=header["stride"])
+        waveform = Waveform(header["wfmpr"], start=header["start"], stride=header["stride"])
+        waveform._curv_loader = curv_loader
+        return waveform
+
+    @staticmethod
+    def _map_wfb_samples(file_name: str, header: dict, offset: int) -> np.memmap | None:
+        if not header["points"]:
+            return None
+        return np.memmap(file_name, dtype=np.dtype(header["dtype"]), mode='r', offset=offset, shape=(header["points"],))
+
+    @staticmethod
+    def _read_window(file, text_format: str) -> tuple[int, int]:
+        """Lê a janela (start e stride) da última linha de um arquivo .txt ou .csv aberto em modo binário."""
+        size = file.seek(0, os.SEEK_END)
+        file.seek(max(size - 128, 0))
+        lines = file.read().decode(errors='replace').splitlines()
+        # A última linha só é confiável se o trecho lido contiver seu início
+        if len(lines) > 1 or size <= 128:
+            pattern = r'(\d+);(\d+)' if text_format == 'txt' else r'Window,(\d+),(\d+)'
+            match = re.fullmatch(pattern, lines[-1].strip()) if lines else None
+            if match:
+                return int(match[1]), int(match[2])
+        return 1, 1
+
+    @staticmethod
+    def _read_curv_text(file_name: str) -> str | None:
+        """Lê somente os dados de CURV? (segunda linha) de um arquivo .txt ou .csv."""
+        with open(file_name, 'r', newline='' if file_name.endswith('.csv') else None) as file:
+            file.readline()
+            if file_name.endswith('.txt'):
+                curv = file.readline().strip()
+            else:
+                row = next(csv.reader(file), None)
+                curv = row[1] if row and len(row) > 1 else None
+        return curv if curv else None
+
+    @staticmethod
+    def _from_text_lazy(file_name: str) -> 'Waveform':
+        """Cria uma Waveform de um arquivo .txt ou .csv lendo só o preâmbulo e a janela; CURV? é lido no primeiro acesso."""
+        text_format = file_name.rsplit('.', 1)[-1]
+        with open(file_name, 'rb') as file:
+            header = file.readline().decode().strip()
+            if text_format == 'csv':
+                header = next(csv.reader([header]))[1]
+            start, stride = Waveform._read_window(file, text_format)
+        waveform = Waveform(header, start=start, stride=stride)
+        waveform._curv_loader = functools.partial(Waveform._read_curv_text, file_name)
+        return waveform
+
     @staticmethod
-    def from_file(file_name: str):
+    def from_file(file_name: str, lazy=False):
         """
-        Cria uma instância da classe Waveform a partir de um arquivo .txt ou .csv.
-        
+        Cria uma instância da classe Waveform a partir de um arquivo .txt, .csv ou .wfb.
+
         Parâmetros:
-            file_name (str): Nome do arquivo (.txt ou .csv).
+            file_name (str): Nome do arquivo (.txt, .csv ou .wfb).
+            lazy (bool, opcional): Lê apenas o preâmbulo e a janela; os dados de CURV? são lidos do
+                arquivo no primeiro acesso (process_curv_data(), get_raw_curv_data(), ...). Útil para
+                listar os metadados de muitos arquivos.
         """
-        if not (file_name.endswith('.txt') or file_name.endswith('.csv')):
-            logging.error("Tipo de arquivo inválido. Use .txt ou .csv.")
-            raise ValueError("Tipo de arquivo inválido. Use .txt ou .csv.")
-        
+        if not file_name.endswith(tuple(f'.{file_format}' for file_format in FILE_FORMATS)):
+            logging.error("Tipo de arquivo inválido. Use .txt, .csv ou .wfb.")
+            raise ValueError("Tipo de arquivo inválido. Use .txt, .csv ou .wfb.")
+
         try:
+            if file_name.endswith('.wfb') or lazy:
+                waveform = Waveform._from_wfb(file_name, lazy) if file_name.endswith('.wfb') \
+                    else Waveform._from_text_lazy(file_name)
+                logging.debug(f"Waveform criada a partir do arquivo {file_name}.")
+                return waveform
             with open(file_name, 'r') as file:
+                window = None
                 if file_name.endswith('.txt'):
                     header = file.readline().strip()
                     curv = file.readline().strip()
+                    window = file.readline().strip().split(';')
                 elif file_name.endswith('.csv'):
-                    reader = csv.reader(file)
-                    header = next(reader)[1]
-                    curv = next(reader)[1] if next(reader, None) else None
-                logging.info(f"Waveform criada a partir do arquivo {file_name}.")
-                return Waveform(header, curv if curv else None)
+                    rows = list(csv.reader(file))
+                    header = rows[0][1]
+                    curv = rows[1][1] if len(rows) > 1 else None
+                    window = rows[2][1:] if len(rows) > 2 else None
+                start, stride = map(int, window) if window and window[0] else (1, 1)
+                logging.debug(f"Waveform criada a partir do arquivo {file_name}.")
+                return Waveform(header, curv if curv else None, start=start, stride=stride)
         except FileNotFoundError:
             logging.error(f"Arquivo não encontrado: {file_name}")
             raise FileNotFoundError("Arquivo não encontrado.")
@@ -190,16 +411,31 @@ class Waveform:
 
 
 class WaveformPlot:
-    def __init__(self, waveform:Waveform):
+    def __init__(self, waveform: Waveform, renderer: WaveformRenderer | None = None):
         """
         Inicializa a classe com um objeto Waveform.
-        
+
+        Os bitmaps são gerados pelo WaveformRenderer, sem matplotlib; o matplotlib só é carregado
+        por plot(), para exibir o gráfico em uma janela.
+
         Parâmetros:
             waveform (Waveform): Objeto Waveform contendo os dados da forma de onda.
+            renderer (WaveformRenderer, opcional): Renderizador reutilizado entre vários WaveformPlot
+                (por exemplo, para gerar miniaturas de muitos arquivos). Padrão: um renderizador compartilhado.
         """
         self.waveform = waveform
-        self.figure, self.ax = plt.subplots()  # Cria uma figura e um eixo para o gráfico
-        logging.info("WaveformPlot inicializado com sucesso.")
+        self.renderer = renderer or _default_renderer()
+        self.figure = None
+        self.ax = None
+        logging.debug("WaveformPlot inicializado com sucesso.")
+
+    def close(self):
+        """Fecha a figura do matplotlib, se plot() a criou, liberando sua memória."""
+        if self.figure is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.figure)
+            self.figure = self.ax = None
+            logging.info("Figura do WaveformPlot fechada.")
 
     def _plot_config(self):
         """
@@ -223,84 +459,70 @@ class WaveformPlot:
 
     def plot(self):
         """
-        Plota a forma de onda no gráfico com limites de y.
+        Plota a forma de onda em uma janela do matplotlib, com limites de y.
         """
         # Obtém os dados de tempo e tensão
         x = self.waveform.get_time_array()
         y = self.waveform.process_curv_data()
-        
-        if x and y:
+
+        if x is not None and y is not None:
+            import matplotlib.pyplot as plt  # Carregado somente quando uma janela é exibida
+            if self.figure is None:
+                self.figure, self.ax = plt.subplots()  # Cria uma figura e um eixo para o gráfico
+            self.ax.clear()
+
             # Plota a forma de onda
             self.ax.plot(x, y, label='Waveform', color='blue')
-            
+
             # Configura o gráfico com limites de y
             self._plot_config()
-            
+
             # Exibe o gráfico
             plt.show()
             logging.info("Gráfico da forma de onda exibido com sucesso.")
         else:
             logging.warning("Dados insuficientes para plotar a forma de onda.")
 
-    def get_bitmap(self):
+    def get_bitmap(self, file_format='png'):
         """
         Retorna o gráfico da forma de onda como um bitmap (array de bytes).
-        
+
+        Parâmetros:
+            file_format (str, opcional): Formato da imagem ('png' ou 'bmp'). Padrão é 'png'.
+
         Retorna:
             bytes: Bitmap da forma de onda.
         """
-        # Obtém os dados de tempo e tensão
-        x = self.waveform.get_time_array()
-        y = self.waveform.process_curv_data()
-        
-        if x and y:
-            # Plota a forma de onda
-            self.ax.plot(x, y, label='Waveform', color='blue')
-            
-            # Configura o gráfico com limites de y
-            self._plot_config()
-            
-            # Cria um buffer de memória para salvar o gráfico
-            buffer = io.BytesIO()
-            self.figure.savefig(buffer, format='jpeg')
-            buffer.seek(0)  # Volta ao início do buffer
-            
-            # Retorna os bytes do bitmap
-            logging.info("Bitmap da forma de onda gerado com sucesso.")
-            return buffer.getvalue()
-        
+        image = self.renderer.render_waveform(self.waveform)
+        if image is not None:
+            logging.debug("Bitmap da forma de onda gerado com sucesso.")
+            return self.renderer.encode(image, file_format)
+
         logging.warning("Dados insuficientes para gerar o bitmap.")
         return None
 
-    def save_bitmap(self, name:str|None=None):
+    def save_bitmap(self, name: str | None = None):
         """
-        Salva o gráfico da forma de onda em um arquivo BMP.
-        
+        Salva o gráfico da forma de onda em um arquivo BMP (ou PNG, se o nome terminar em .png).
+
         Parâmetros:
             name (str, opcional): Nome do arquivo BMP. Se None, usa um nome padrão.
         """
         if not name:
             name = "waveform_plot.bmp"
-        
-        # Obtém os dados de tempo e tensão
-        x = self.waveform.get_time_array()
-        y = self.waveform.process_curv_data()
-        
-        if x and y:
-            # Plota a forma de onda
-            self.ax.plot(x, y, label='Waveform', color='blue')
-            
-            # Configura o gráfico com limites de y
-            self._plot_config()
-            
-            # Salva o gráfico em um arquivo BMP
-            self.figure.savefig(name, format='jpeg')
-            plt.close(self.figure)
+
+        if self.renderer.save(self.waveform, name):
             logging.info(f"Gráfico salvo como {name}.")
         else:
             logging.warning("Dados insuficientes para salvar o gráfico.")
 
 
+@functools.lru_cache(maxsize=1)
+def _default_renderer() -> WaveformRenderer:
+    """Renderizador compartilhado pelos WaveformPlot criados sem um renderizador próprio."""
+    return WaveformRenderer()
+
+
 if __name__ == '__main__':
     try:
         # Carrega a forma de onda a partir de um arquivo TXT
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from src import Tektronix, SimulatedTDS340A
+
+
+@pytest.fixture
+def tektronix():
+    tektronix = Tektronix(transport=SimulatedTDS340A(realtime=False, seed=0))
+    yield tektronix
+    tektronix.close_port()
+
+
+@pytest.mark.parametrize('start, stop, stride', [(100, 199, 5), (501, 1000, 1), (1, 1000, 3)])
+def test_window_times_match_full_capture(tektronix, start, stop, stride):
+    """Uma captura com janela (set_window) dá a cada ponto o mesmo tempo que a captura completa."""
+    full = tektronix.acquire(['CH1'])['CH1'].get_time_array()
+    tektronix.set_window(start, stop, stride)
+    window = tektronix.acquire(['CH1'])['CH1'].get_time_array()
+    assert np.allclose(window, full[start - 1:stop:stride])
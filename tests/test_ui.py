@@ -0,0 +1,23 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.skipif(shutil.which('pyside6-uic') is None, reason="pyside6-uic não está instalado")
+def test_compiled_ui_is_up_to_date():
+    """ui/ui_mainwindow.py é o resultado do pyside6-uic sobre o ui/mainwindow.ui versionado."""
+    generated = subprocess.run(['pyside6-uic', os.path.join(ROOT, 'ui', 'mainwindow.ui')],
+                               capture_output=True, text=True, check=True).stdout
+    with open(os.path.join(ROOT, 'ui', 'ui_mainwindow.py')) as file:
+        committed = file.read()
+
+    def strip_version(source: str) -> list[str]:
+        # A versão do compilador no cabeçalho não muda a interface gerada
+        return [line for line in source.splitlines() if not line.startswith('## Created by:')]
+
+    assert strip_version(generated) == strip_version(committed), \
+        "Gere novamente com: pyside6-uic ui/mainwindow.ui -o ui/ui_mainwindow.py"
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'mainwindow.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QCheckBox, QComboBox, QGridLayout,
+    QHBoxLayout, QLabel, QLineEdit, QMainWindow,
+    QMenuBar, QPushButton, QSizePolicy, QSpacerItem,
+    QStatusBar, QTabWidget, QTextEdit, QToolBar,
+    QVBoxLayout, QWidget)
+
+from pyqtgraph import PlotWidget
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        if not MainWindow.objectName():
+            MainWindow.setObjectName(u"MainWindow")
+        MainWindow.resize(800, 736)
+        self.centralwidget = QWidget(MainWindow)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.verticalLayout = QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.tabWidget = QTabWidget(self.centralwidget)
+        self.tabWidget.setObjectName(u"tabWidget")
+        self.Workspace = QWidget()
+        self.Workspace.setObjectName(u"Workspace")
+        self.verticalLayout_5 = QVBoxLayout(self.Workspace)
+        self.verticalLayout_5.setObjectName(u"verticalLayout_5")
+        self.horizontalLayout_3 = QHBoxLayout()
+        self.horizontalLayout_3.setObjectName(u"horizontalLayout_3")
+        self.verticalLayout_2 = QVBoxLayout()
+        self.verticalLayout_2.setObjectName(u"verticalLayout_2")
+        self.CH1Freq = QPushButton(self.Workspace)
+        self.CH1Freq.setObjectName(u"CH1Freq")
+
+        self.verticalLayout_2.addWidget(self.CH1Freq)
+
+        self.CH2Freq = QPushButton(self.Workspace)
+        self.CH2Freq.setObjectName(u"CH2Freq")
+
+        self.verticalLayout_2.addWidget(self.CH2Freq)
+
+        self.CH1Waveform = QPushButton(self.Workspace)
+        self.CH1Waveform.setObjectName(u"CH1Waveform")
+
+        self.verticalLayout_2.addWidget(self.CH1Waveform)
+
+        self.CH2Waveform = QPushButton(self.Workspace)
+        self.CH2Waveform.setObjectName(u"CH2Waveform")
+
+        self.verticalLayout_2.addWidget(self.CH2Waveform)
+
+        self.MathWaveform = QPushButton(self.Workspace)
+        self.MathWaveform.setObjectName(u"MathWaveform")
+
+        self.verticalLayout_2.addWidget(self.MathWaveform)
+
+        self.Ref1Waveform = QPushButton(self.Workspace)
+        self.Ref1Waveform.setObjectName(u"Ref1Waveform")
+
+        self.verticalLayout_2.addWidget(self.Ref1Waveform)
+
+        self.Ref2Waveform = QPushButton(self.Workspace)
+        self.Ref2Waveform.setObjectName(u"Ref2Waveform")
+
+        self.verticalLayout_2.addWidget(self.Ref2Waveform)
+
+        self.Run = QPushButton(self.Workspace)
+        self.Run.setObjectName(u"Run")
+        self.Run.setCheckable(True)
+
+        self.verticalLayout_2.addWidget(self.Run)
+
+        self.RunReferences = QCheckBox(self.Workspace)
+        self.RunReferences.setObjectName(u"RunReferences")
+
+        self.verticalLayout_2.addWidget(self.RunReferences)
+
+        self.RunRate = QLabel(self.Workspace)
+        self.RunRate.setObjectName(u"RunRate")
+
+        self.verticalLayout_2.addWidget(self.RunRate)
+
+        self.verticalSpacer_2 = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.verticalLayout_2.addItem(self.verticalSpacer_2)
+
+
+        self.horizontalLayout_3.addLayout(self.verticalLayout_2)
+
+        self.verticalLayout_4 = QVBoxLayout()
+        self.verticalLayout_4.setObjectName(u"verticalLayout_4")
+        self.plotWidget = PlotWidget(self.Workspace)
+        self.plotWidget.setObjectName(u"plotWidget")
+
+        self.verticalLayout_4.addWidget(self.plotWidget)
+
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName(u"horizontalLayout")
+        self.Save = QPushButton(self.Workspace)
+        self.Save.setObjectName(u"Save")
+
+        self.horizontalLayout.addWidget(self.Save)
+
+        self.TypeFile = QComboBox(self.Workspace)
+        self.TypeFile.setObjectName(u"TypeFile")
+
+        self.horizontalLayout.addWidget(self.TypeFile)
+
+        self.Clear = QPushButton(self.Workspace)
+        self.Clear.setObjectName(u"Clear")
+
+        self.horizontalLayout.addWidget(self.Clear)
+
+
+        self.verticalLayout_4.addLayout(self.horizontalLayout)
+
+
+        self.horizontalLayout_3.addLayout(self.verticalLayout_4)
+
+
+        self.verticalLayout_5.addLayout(self.horizontalLayout_3)
+
+        self.ResultArea = QTextEdit(self.Workspace)
+        self.ResultArea.setObjectName(u"ResultArea")
+        self.ResultArea.setReadOnly(True)
+
+        self.verticalLayout_5.addWidget(self.ResultArea)
+
+        self.tabWidget.addTab(self.Workspace, "")
+        self.Informations = QWidget()
+        self.Informations.setObjectName(u"Informations")
+        self.gridLayout = QGridLayout(self.Informations)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.SerialNumber = QLineEdit(self.Informations)
+        self.SerialNumber.setObjectName(u"SerialNumber")
+        self.SerialNumber.setReadOnly(True)
+
+        self.gridLayout.addWidget(self.SerialNumber, 1, 2, 1, 1)
+
+        self.label_3 = QLabel(self.Informations)
+        self.label_3.setObjectName(u"label_3")
+
+        self.gridLayout.addWidget(self.label_3, 2, 0, 1, 1)
+
+        self.label_5 = QLabel(self.Informations)
+        self.label_5.setObjectName(u"label_5")
+
+        self.gridLayout.addWidget(self.label_5, 4, 0, 1, 1)
+
+        self.Model = QLineEdit(self.Informations)
+        self.Model.setObjectName(u"Model")
+        self.Model.setReadOnly(True)
+
+        self.gridLayout.addWidget(self.Model, 0, 2, 1, 1)
+
+        self.verticalSpacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.gridLayout.addItem(self.verticalSpacer, 6, 0, 1, 1)
+
+        self.Firmware = QLineEdit(self.Informations)
+        self.Firmware.setObjectName(u"Firmware")
+        self.Firmware.setReadOnly(True)
+
+        self.gridLayout.addWidget(self.Firmware, 2, 2, 1, 1)
+
+        self.label_4 = QLabel(self.Informations)
+        self.label_4.setObjectName(u"label_4")
+
+        self.gridLayout.addWidget(self.label_4, 5, 0, 1, 1)
+
+        self.label_2 = QLabel(self.Informations)
+        self.label_2.setObjectName(u"label_2")
+
+        self.gridLayout.addWidget(self.label_2, 1, 0, 1, 1)
+
+        self.label = QLabel(self.Informations)
+        self.label.setObjectName(u"label")
+
+        self.gridLayout.addWidget(self.label, 0, 0, 1, 1)
+
+        self.Port = QComboBox(self.Informations)
+        self.Port.setObjectName(u"Port")
+
+        self.gridLayout.addWidget(self.Port, 4, 2, 1, 1)
+
+        self.Baudrate = QComboBox(self.Informations)
+        self.Baudrate.setObjectName(u"Baudrate")
+
+        self.gridLayout.addWidget(self.Baudrate, 5, 2, 1, 1)
+
+        self.tabWidget.addTab(self.Informations, "")
+
+        self.verticalLayout.addWidget(self.tabWidget)
+
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QMenuBar(MainWindow)
+        self.menubar.setObjectName(u"menubar")
+        self.menubar.setGeometry(QRect(0, 0, 800, 32))
+        MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QStatusBar(MainWindow)
+        self.statusbar.setObjectName(u"statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+        self.toolBar = QToolBar(MainWindow)
+        self.toolBar.setObjectName(u"toolBar")
+        MainWindow.addToolBar(Qt.ToolBarArea.TopToolBarArea, self.toolBar)
+
+        self.retranslateUi(MainWindow)
+
+        self.tabWidget.setCurrentIndex(0)
+
+
+        QMetaObject.connectSlotsByName(MainWindow)
+    # setupUi
+
+    def retranslateUi(self, MainWindow):
+        MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"MainWindow", None))
+        self.CH1Freq.setText(QCoreApplication.translate("MainWindow", u"Ch1 Freq", None))
+        self.CH2Freq.setText(QCoreApplication.translate("MainWindow", u"Ch2 Freq", None))
+        self.CH1Waveform.setText(QCoreApplication.translate("MainWindow", u"CH1 Waveform", None))
+        self.CH2Waveform.setText(QCoreApplication.translate("MainWindow", u"CH2 Waveform", None))
+        self.MathWaveform.setText(QCoreApplication.translate("MainWindow", u"Math Waveform", None))
+        self.Ref1Waveform.setText(QCoreApplication.translate("MainWindow", u"Ref1 Waveform", None))
+        self.Ref2Waveform.setText(QCoreApplication.translate("MainWindow", u"Ref2 Waveform", None))
+        self.Run.setText(QCoreApplication.translate("MainWindow", u"Run", None))
+        self.RunReferences.setText(QCoreApplication.translate("MainWindow", u"Run Ref1/Ref2", None))
+        self.RunRate.setText("")
+        self.Save.setText(QCoreApplication.translate("MainWindow", u"Save Waveform", None))
+        self.Clear.setText(QCoreApplication.translate("MainWindow", u"Clear", None))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.Workspace), QCoreApplication.translate("MainWindow", u"Workspace", None))
+        self.label_3.setText(QCoreApplication.translate("MainWindow", u"Firmware version", None))
+        self.label_5.setText(QCoreApplication.translate("MainWindow", u"Port", None))
+        self.label_4.setText(QCoreApplication.translate("MainWindow", u"Baudrate", None))
+        self.label_2.setText(QCoreApplication.translate("MainWindow", u"Serial numeber", None))
+        self.label.setText(QCoreApplication.translate("MainWindow", u"Model", None))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.Informations), QCoreApplication.translate("MainWindow", u"Informations", None))
+        self.toolBar.setWindowTitle(QCoreApplication.translate("MainWindow", u"toolBar", None))
+    # retranslateUi
+